@@ -0,0 +1,227 @@
+"""Per-step time and memory benchmark for Dataset/data_cleaning.py.
+
+Generates synthetic raw extracts in the real 15-column schema (with the same
+kinds of mess the cleaner fixes: '%' rates, inconsistent casing/whitespace,
+missing sessions, unparseable dates, attended > assigned), runs the cleaning
+pipeline one step at a time and prints machine-readable JSON:
+
+    python Benchmarks/cleaning_benchmark.py --sizes 10000,1000000 --output bench.json
+
+Steps are the raw read, each rule from cleaning_rules.json, and the CSV,
+Parquet and Arrow writes. Each step reports wall time and peak RSS while it ran
+(sampled with psutil when installed; otherwise the process high-water mark,
+which only ever grows).
+"""
+import argparse
+import contextlib
+import json
+import platform
+import resource
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'Dataset'))
+import data_cleaning  # noqa: E402
+from cleaning_rules import apply_rule  # noqa: E402
+
+try:
+    import psutil
+except ImportError:  # fall back to the process high-water mark
+    psutil = None
+
+DEFAULT_SIZES = [10_000, 1_000_000, 10_000_000]
+
+# Header exactly as it appears in the raw workbook
+RAW_HEADER = [
+    'Patient_ID', 'Patient_Name', 'Age', 'Gender', 'City',
+    'Registration_Date', 'Program_Type', 'Therapy_Type',
+    'Total_Sessions_Assigned', 'Sessions_Attended',
+    'Attendance_Rate_%', 'Provider_Name', 'Case_Status',
+    'Risk_Level', 'Satisfaction_Score'
+]
+
+
+# ----------------------------
+# SYNTHETIC RAW DATA
+# ----------------------------
+def generate_raw(n_rows, seed=42):
+    """Vectorized synthetic raw extract with realistic dirt"""
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1001, 1001 + n_rows).astype(str)
+
+    total = rng.integers(1, 25, n_rows)
+    attended = rng.integers(0, total + 1)
+    overbooked = rng.random(n_rows) < 0.01  # data error the cleaner caps
+    attended[overbooked] = total[overbooked] + 1
+
+    days = rng.integers(0, 730, n_rows)
+    dates = (np.datetime64('2023-01-01') + days).astype(str).astype(object)
+    dates[rng.random(n_rows) < 0.002] = 'not a date'
+
+    rate = np.round(attended / total * 100, 2).astype(str).astype(object)
+    with_pct = rng.random(n_rows) < 0.5
+    rate[with_pct] = rate[with_pct] + '%'
+
+    age = rng.integers(18, 75, n_rows).astype(float)
+    age[rng.random(n_rows) < 0.005] = np.nan
+    sessions = attended.astype(float)
+    sessions[rng.random(n_rows) < 0.005] = np.nan
+
+    return pd.DataFrame({
+        'Patient_ID': np.char.add('P-', ids),
+        'Patient_Name': np.char.add('Patient_', ids),
+        'Age': age,
+        'Gender': rng.choice(['Male', 'Female', 'Other', 'M', 'F', ' female ', 'othergender'], n_rows),
+        'City': rng.choice(['Pune', 'Kolkata', 'Chennai', 'Nagpur', 'Hyderabad', 'Delhi',
+                            'Mumbai', 'Bangalore', ' mumbai', 'DELHI '], n_rows),
+        'Registration_Date': dates,
+        'Program_Type': rng.choice(['Therapy & Counseling', 'Psychiatric Care', 'Substance Use Treatment'], n_rows),
+        'Therapy_Type': rng.choice(['DBT', 'Group Therapy', 'Trauma Counseling', 'Mindfulness Therapy',
+                                    'CBT', 'Family Therapy'], n_rows),
+        'Total_Sessions_Assigned': total,
+        'Sessions_Attended': sessions,
+        'Attendance_Rate_%': rate,
+        'Provider_Name': np.char.add('Provider_', rng.integers(1, 50, n_rows).astype(str)),
+        'Case_Status': rng.choice(['Completed', 'In Progress', 'Active', 'Dropped',
+                                   'inprogress', 'ACTIVECASE', ' completed'], n_rows),
+        'Risk_Level': rng.choice(['Low', 'Moderate', 'High'], n_rows),
+        'Satisfaction_Score': rng.integers(1, 6, n_rows),
+    }, columns=RAW_HEADER)
+
+
+# ----------------------------
+# MEASUREMENT
+# ----------------------------
+def current_rss_mb():
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 2**20
+    # ru_maxrss is KiB on Linux, bytes on macOS; it is a high-water mark
+    scale = 2**20 if sys.platform == 'darwin' else 2**10
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+class PeakRSSSampler:
+    """Track the peak resident set size while a block runs (sampled in a thread)"""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.start_mb = current_rss_mb()
+        self.peak_mb = self.start_mb
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.end_mb = current_rss_mb()
+        self.peak_mb = max(self.peak_mb, self.end_mb)
+
+
+def measure(steps, name, func, *args):
+    """Run `func(*args)`, append its timing/memory to `steps` and return its result"""
+    with PeakRSSSampler() as rss:
+        start = time.perf_counter()
+        result = func(*args)
+        seconds = time.perf_counter() - start
+    steps.append({
+        'step': name,
+        'seconds': round(seconds, 4),
+        'peak_rss_mb': round(rss.peak_mb, 1),
+        'rss_delta_mb': round(rss.end_mb - rss.start_mb, 1),
+    })
+    return result
+
+
+# ----------------------------
+# BENCHMARK
+# ----------------------------
+def bench_size(n_rows, workdir, excel_max_rows, seed):
+    """Benchmark every pipeline step on one synthetic extract"""
+    raw = generate_raw(n_rows, seed)
+    # Excel tops out at 1,048,576 rows and is impractically slow to write far
+    # below that, so larger extracts are benchmarked from CSV
+    input_format = 'xlsx' if n_rows <= excel_max_rows else 'csv'
+    input_path = Path(workdir) / f'raw_{n_rows}.{input_format}'
+    if input_format == 'xlsx':
+        raw.to_excel(input_path, index=False)
+    else:
+        raw.to_csv(input_path, index=False)
+    del raw
+
+    steps = []
+    df = measure(steps, f'read_{input_format}', data_cleaning.read_raw, input_path)
+    df.columns = data_cleaning.COLUMNS
+
+    rule_reports = []
+    for rule in data_cleaning.RULES:
+        df, report = measure(steps, f"rule:{rule['name']}", apply_rule, df, rule)
+        rule_reports.append(report)
+
+    output_path = Path(workdir) / f'clean_{n_rows}.csv'
+    measure(steps, 'write_csv', lambda: df.to_csv(output_path, index=False))
+    if data_cleaning.pa is not None:
+        measure(steps, 'write_parquet', data_cleaning.write_parquet, df, output_path)
+        measure(steps, 'write_arrow', data_cleaning.write_arrow, df, output_path)
+
+    return {
+        'rows': n_rows,
+        'rows_out': len(df),
+        'input_format': input_format,
+        'total_seconds': round(sum(step['seconds'] for step in steps), 4),
+        'steps': steps,
+        'rules': rule_reports,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark data_cleaning.py step by step")
+    parser.add_argument('--sizes', default=','.join(str(n) for n in DEFAULT_SIZES),
+                        help="comma-separated row counts (default 10k, 1M, 10M)")
+    parser.add_argument('--excel-max-rows', type=int, default=100_000,
+                        help="largest size read from .xlsx; bigger sizes are read from CSV")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    runs = []
+    # The cleaner's progress prints go to stderr so stdout stays valid JSON
+    with tempfile.TemporaryDirectory() as workdir, contextlib.redirect_stdout(sys.stderr):
+        for n_rows in (int(size) for size in args.sizes.split(',')):
+            print(f"benchmarking {n_rows:,} rows...", file=sys.stderr)
+            runs.append(bench_size(n_rows, workdir, args.excel_max_rows, args.seed))
+
+    result = {
+        'benchmark': 'data_cleaning',
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'rss_method': 'psutil sampling' if psutil is not None else 'ru_maxrss high-water mark',
+        'runs': runs,
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
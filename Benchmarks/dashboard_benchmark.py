@@ -0,0 +1,281 @@
+"""Headless rerun-latency benchmark for the Streamlit dashboards.
+
+Runs StreamlitDashboard/app.py, app2.py and app3.py with Streamlit's AppTest
+(no browser, no server), scripts the interactions analysts actually do
+(switching data source, changing sidebar filters, switching views, choosing
+Relationship axes) and prints machine-readable JSON:
+
+    python Benchmarks/dashboard_benchmark.py --sizes 10000,1000000 --output bench.json
+
+app.py is pointed (DASHBOARD_DATA_PATH) at two synthetic datasets per size:
+synthetic patients from Dataset/generate_synthetic_data.py, written with the
+Parquet copy, profile and KPI cube next to them like the real default
+dataset, and a generic sales table, which opens the Overview / Distributions /
+Relationships views (they only show for non-patient data). app2.py and
+app3.py bring their own fixed data and are benchmarked once.
+
+AppTest can't upload files, so "switch data source" flips to the upload
+option (which stops at its prompt) and back to the default dataset.
+
+Every scenario repeats its interaction and reports p50/p95/max rerun time
+and the peak RSS while it ran (sampled with psutil when installed;
+otherwise the process high-water mark, which only ever grows). Cold starts
+clear Streamlit's caches first; other scenarios run warm, as a user would
+see them once the server has the data loaded.
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'Dataset'))
+from cleaning_benchmark import PeakRSSSampler, psutil  # noqa: E402
+from generate_synthetic_data import run_single_file  # noqa: E402
+
+DASHBOARD_DIR = Path(__file__).resolve().parent.parent / 'StreamlitDashboard'
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+# ----------------------------
+# SYNTHETIC DATASETS
+# ----------------------------
+def write_patient_dataset(n_rows, workdir, seed):
+    """Synthetic cleaned patients with their sidecar files; returns the CSV path"""
+    output_path = Path(workdir) / f'patients_{n_rows}' / 'patients_master_clean.csv'
+    with contextlib.redirect_stdout(sys.stderr):
+        run_single_file(n_rows, output_path, seed=seed)
+    return output_path
+
+
+def generate_generic(n_rows, seed=42):
+    """Vectorized non-patient table: a few categoricals, a date and correlated numerics"""
+    rng = np.random.default_rng(seed)
+    units = rng.integers(1, 50, n_rows)
+    price = np.round(rng.lognormal(3, 0.6, n_rows), 2)
+    return pd.DataFrame({
+        'Region': rng.choice(['North', 'South', 'East', 'West', 'Central', 'Coastal', 'Highlands', 'Islands'], n_rows),
+        'Segment': rng.choice(['Consumer', 'Corporate', 'Home Office', 'Small Business'], n_rows, p=[0.5, 0.3, 0.15, 0.05]),
+        'Channel': rng.choice(['Online', 'Retail', 'Wholesale', 'Partner', 'Phone'], n_rows),
+        'Order_Date': (np.datetime64('2023-01-01') + rng.integers(0, 730, n_rows)).astype(str),
+        'Units': units,
+        'Price': price,
+        'Revenue': np.round(units * price * rng.normal(1, 0.05, n_rows), 2),
+        'Discount': np.round(rng.beta(2, 8, n_rows), 3),
+        'Rating': rng.integers(1, 6, n_rows),
+    })
+
+
+def write_generic_dataset(n_rows, workdir, seed):
+    output_path = Path(workdir) / f'generic_{n_rows}.csv'
+    generate_generic(n_rows, seed).to_csv(output_path, index=False)
+    return output_path
+
+
+# ----------------------------
+# SCENARIOS
+# ----------------------------
+# A scenario is (name, prepare, interact): `prepare(at)` sets up untimed
+# state, `interact(at, i)` changes a widget before the i-th timed rerun
+def cycle(widget, i):
+    """Set a radio or selectbox to its next option (wraps around)"""
+    options = widget.options
+    widget.set_value(options[(options.index(widget.value) + 1) % len(options)])
+
+
+def toggle_last(widget, i):
+    """Drop the multiselect's last selected value on even runs, restore it on odd ones"""
+    full = list(widget.options)
+    widget.set_value(full if i % 2 else full[:-1])
+
+
+def select_view(key, view_index):
+    def prepare(at):
+        radio = at.radio(key=key)
+        radio.set_value(radio.options[view_index]).run()
+    return prepare
+
+
+def no_prepare(at):
+    pass
+
+
+def first_filter(at):
+    return at.sidebar.multiselect[0]
+
+
+def relationship_axes(at, i):
+    # x, y and color in turn, each to its next option
+    cycle(at.selectbox(key=('x_axis', 'y_axis', 'color_by')[i % 3]), i)
+
+
+def distribution_settings(at, i):
+    cycle(at.selectbox(key=('dist_col', 'chart_type')[i % 2]), i)
+
+
+PATIENT_SCENARIOS = [
+    ('rerun', no_prepare, lambda at, i: None),
+    ('switch_view', no_prepare, lambda at, i: cycle(at.radio(key='mental_health_view'), i)),
+    ('change_filter', no_prepare, lambda at, i: toggle_last(first_filter(at), i)),
+    ('switch_data_source', no_prepare, lambda at, i: cycle(at.sidebar.radio[0], i)),
+]
+
+GENERIC_SCENARIOS = [
+    ('switch_view', no_prepare, lambda at, i: cycle(at.radio(key='generic_view'), i)),
+    ('change_filter', no_prepare, lambda at, i: toggle_last(first_filter(at), i)),
+    ('distribution_settings', select_view('generic_view', 1), distribution_settings),
+    ('relationship_axes', select_view('generic_view', 2), relationship_axes),
+]
+
+APP2_SCENARIOS = [
+    ('switch_page', no_prepare, lambda at, i: cycle(at.sidebar.radio[0], i)),
+    ('reorder_list', lambda at: at.sidebar.radio[0].set_value('📋 Sortable List').run(),
+     lambda at, i: toggle_last(at.multiselect[0], i)),
+]
+
+APP3_SCENARIOS = [
+    ('rerun', no_prepare, lambda at, i: None),
+    ('change_filter', no_prepare, lambda at, i: toggle_last(at.sidebar.multiselect[i % 3], i // 3)),
+]
+
+
+# ----------------------------
+# MEASUREMENT
+# ----------------------------
+def summarize(name, seconds, rss, error=None):
+    times_ms = np.array(seconds) * 1000
+    result = {
+        'scenario': name,
+        'reruns': len(seconds),
+        'p50_ms': round(float(np.percentile(times_ms, 50)), 2) if len(seconds) else None,
+        'p95_ms': round(float(np.percentile(times_ms, 95)), 2) if len(seconds) else None,
+        'max_ms': round(float(times_ms.max()), 2) if len(seconds) else None,
+        'peak_rss_mb': round(rss.peak_mb, 1),
+        'rss_delta_mb': round(rss.end_mb - rss.start_mb, 1),
+    }
+    if error:
+        result['error'] = error
+    return result
+
+
+def timed_run(at, seconds):
+    """Rerun the script, record its wall time and return its exception text, if any"""
+    start = time.perf_counter()
+    at.run()
+    seconds.append(time.perf_counter() - start)
+    if at.exception:
+        return at.exception[0].message
+    return None
+
+
+def clear_caches():
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def bench_cold_start(script, repeats, timeout):
+    """First run of a fresh session with empty caches (load, type detection, indexes)"""
+    seconds = []
+    error = None
+    with PeakRSSSampler() as rss:
+        for _ in range(repeats):
+            clear_caches()
+            error = timed_run(AppTest.from_file(str(script), default_timeout=timeout), seconds)
+            if error:
+                break
+    return summarize('cold_start', seconds, rss, error)
+
+
+def bench_scenarios(script, scenarios, repeats, timeout):
+    """Warm scenarios, each in a fresh session of `script`"""
+    results = []
+    for name, prepare, interact in scenarios:
+        at = AppTest.from_file(str(script), default_timeout=timeout)
+        seconds = []
+        error = None
+        with PeakRSSSampler() as rss:
+            at.run()
+            error = at.exception[0].message if at.exception else None
+            if not error:
+                prepare(at)
+                error = at.exception[0].message if at.exception else None
+            for i in range(repeats if not error else 0):
+                interact(at, i)
+                error = timed_run(at, seconds)
+                if error:
+                    break
+        results.append(summarize(name, seconds, rss, error))
+    return results
+
+
+def bench_app(script, scenarios, repeats, cold_repeats, timeout):
+    print(f"benchmarking {script.name}...", file=sys.stderr)
+    return [bench_cold_start(script, cold_repeats, timeout)] + bench_scenarios(script, scenarios, repeats, timeout)
+
+
+def bench_size(n_rows, workdir, args):
+    """app.py against a patient and a generic dataset of `n_rows` rows"""
+    datasets = {}
+    for dataset, writer, scenarios in [('patients', write_patient_dataset, PATIENT_SCENARIOS),
+                                       ('generic', write_generic_dataset, GENERIC_SCENARIOS)]:
+        print(f"generating {n_rows:,} {dataset} rows...", file=sys.stderr)
+        os.environ['DASHBOARD_DATA_PATH'] = str(writer(n_rows, workdir, args.seed))
+        datasets[dataset] = bench_app(DASHBOARD_DIR / 'app.py', scenarios, args.repeats, args.cold_repeats, args.timeout)
+    os.environ.pop('DASHBOARD_DATA_PATH')
+    clear_caches()
+    return {'rows': n_rows, 'datasets': datasets}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dashboard rerun latency headlessly")
+    parser.add_argument('--sizes', default=','.join(str(n) for n in DEFAULT_SIZES),
+                        help="comma-separated row counts for app.py (default 10k, 100k, 1M)")
+    parser.add_argument('--repeats', type=int, default=20, help="timed reruns per scenario")
+    parser.add_argument('--cold-repeats', type=int, default=3, help="timed cold starts per app")
+    parser.add_argument('--timeout', type=float, default=600, help="seconds one rerun may take")
+    parser.add_argument('--skip-demos', action='store_true', help="only benchmark app.py")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    runs = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_rows in (int(size) for size in args.sizes.split(',')):
+            runs.append(bench_size(n_rows, workdir, args))
+
+    demos = {}
+    if not args.skip_demos:
+        demos['app2.py'] = bench_app(DASHBOARD_DIR / 'app2.py', APP2_SCENARIOS, args.repeats, args.cold_repeats, args.timeout)
+        demos['app3.py'] = bench_app(DASHBOARD_DIR / 'app3.py', APP3_SCENARIOS, args.repeats, args.cold_repeats, args.timeout)
+
+    result = {
+        'benchmark': 'dashboard_reruns',
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'streamlit': st.__version__,
+        'rss_method': 'psutil sampling' if psutil is not None else 'ru_maxrss high-water mark',
+        'repeats': args.repeats,
+        'runs': runs,
+        'demos': demos,
+    }
+    text = json.dumps(result, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
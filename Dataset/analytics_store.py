@@ -0,0 +1,144 @@
+import argparse
+import re
+import sqlite3
+import pandas as pd
+from pathlib import Path
+
+from data_cleaning import DEFAULT_CHUNKSIZE, OUTPUT_PATH, iter_clean_chunks
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+# Named after the database the SQLQueries/*.sql files `USE`
+DB_PATH = Path(__file__).parent / 'CleanedData' / 'mentalhealthanalytics.db'
+TABLE = 'patients_master_clean'
+INDEXED_COLUMNS = ['Provider_Name', 'Case_Status', 'Registration_Date']
+
+SQL_DIR = Path(__file__).parent.parent / 'SQLQueries'
+# DataCleaning.sql mutates the table, so it runs inside a transaction that
+# is rolled back (a dry run reporting affected rows) unless --commit-cleaning
+SQL_FILES = ['DataCleaning.sql', 'DataValidation.sql', 'KPICalculations.sql']
+CLEANING_SQL = 'DataCleaning.sql'
+
+# The query files are written for MySQL; these are the aliases they use that
+# SQLite treats as reserved words
+SQLITE_RESERVED_ALIASES = {'CHECK', 'GROUP', 'INDEX', 'LIMIT', 'ORDER', 'TABLE', 'VALUES'}
+
+
+# ----------------------------
+# BUILD THE STORE
+# ----------------------------
+def build_store(clean_path=OUTPUT_PATH, db_path=DB_PATH, chunksize=DEFAULT_CHUNKSIZE):
+    """Load the cleaned dataset into an indexed SQLite file, chunk by chunk.
+
+    The database is built next to the target and swapped in at the end, so a
+    query reading the old file never sees a half-loaded table.
+    """
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = db_path.with_suffix('.db.tmp')
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+    rows = 0
+    with sqlite3.connect(tmp_path) as conn:
+        for chunk in iter_clean_chunks(clean_path, chunksize):
+            # Plain text/ISO dates so the SQL files' string date comparisons work
+            for col in chunk.columns:
+                if isinstance(chunk[col].dtype, pd.CategoricalDtype):
+                    chunk[col] = chunk[col].astype(object)
+            if 'Registration_Date' in chunk.columns:
+                chunk['Registration_Date'] = pd.to_datetime(chunk['Registration_Date']).dt.strftime('%Y-%m-%d')
+            chunk.to_sql(TABLE, conn, if_exists='append', index=False)
+            rows += len(chunk)
+        for col in INDEXED_COLUMNS:
+            conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{col.lower()} ON {TABLE} ("{col}")')
+        conn.execute('ANALYZE')
+    conn.close()
+    tmp_path.replace(db_path)
+    return rows
+
+
+# ----------------------------
+# RUN SQLQueries/*.sql
+# ----------------------------
+def split_statements(sql_text):
+    """Split a .sql file into statements, dropping comments and MySQL `USE`"""
+    statements, buffer = [], ''
+    for line in sql_text.splitlines():
+        if line.strip().startswith('--'):
+            continue
+        buffer += line + '\n'
+        if sqlite3.complete_statement(buffer):
+            statement = buffer.strip().rstrip(';').strip()
+            buffer = ''
+            if statement and not statement.upper().startswith('USE '):
+                statements.append(to_sqlite(statement))
+    if buffer.strip():
+        statements.append(to_sqlite(buffer.strip().rstrip(';')))
+    return statements
+
+
+def to_sqlite(statement):
+    """Quote MySQL aliases that are reserved words in SQLite (`AS Check`)"""
+    return re.sub(
+        r'\bAS\s+([A-Za-z_]+)\b',
+        lambda m: f'AS "{m.group(1)}"' if m.group(1).upper() in SQLITE_RESERVED_ALIASES else m.group(0),
+        statement,
+    )
+
+
+def run_sql_file(conn, sql_path, commit=True):
+    """Execute every statement in `sql_path`; returns (statement, result) pairs.
+
+    SELECTs return a DataFrame; data-modifying statements return the number of
+    affected rows. With commit=False the whole file is rolled back.
+    """
+    results = []
+    try:
+        for statement in split_statements(Path(sql_path).read_text()):
+            cursor = conn.execute(statement)
+            if cursor.description:
+                columns = [d[0] for d in cursor.description]
+                results.append((statement, pd.DataFrame(cursor.fetchall(), columns=columns)))
+            else:
+                results.append((statement, cursor.rowcount))
+    except Exception:
+        conn.rollback()
+        raise
+    if commit:
+        conn.commit()
+    else:
+        conn.rollback()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load the cleaned data into SQLite and run SQLQueries/*.sql")
+    parser.add_argument('--input', default=str(OUTPUT_PATH), help="cleaned CSV (its .parquet copy is preferred)")
+    parser.add_argument('--db', default=str(DB_PATH), help="SQLite file to build")
+    parser.add_argument('--sql', nargs='*', default=SQL_FILES, help="query files under SQLQueries/ to run")
+    parser.add_argument('--commit-cleaning', action='store_true',
+                        help=f"persist the changes made by {CLEANING_SQL} instead of rolling them back")
+    parser.add_argument('--skip-load', action='store_true', help="run the queries against the existing store")
+    args = parser.parse_args()
+
+    if not args.skip_load:
+        rows = build_store(args.input, args.db)
+        print(f"✅ SQLITE STORE BUILT: {rows:,} rows -> {args.db}")
+
+    with sqlite3.connect(args.db) as conn:
+        for name in args.sql:
+            sql_path = SQL_DIR / name
+            commit = name != CLEANING_SQL or args.commit_cleaning
+            print(f"\n=== {name}{'' if commit else ' (dry run, rolled back)'} ===")
+            for statement, result in run_sql_file(conn, sql_path, commit=commit):
+                print(f"\n{statement.splitlines()[0][:80]}")
+                if isinstance(result, pd.DataFrame):
+                    print(result.to_string(index=False))
+                else:
+                    print(f"rows affected: {result}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# ----------------------------
+# RULE SPEC
+# ----------------------------
+# Rules live in cleaning_rules.json and run top to bottom. Supported types:
+#   parse_number  - strip characters, parse to float, optionally divide (divide_by)
+#   normalize     - string transforms (strip/lower/upper/title) then a value map
+#   parse_date    - parse to datetime (unparseable -> NaT)
+#   drop_missing  - drop rows missing any of `columns`
+#   range         - min/max (or min_column/max_column) check with action
+#                   clip, null or drop
+#   derive        - new column from a pandas `eval` expression
+# Value-level rules (parse_number, normalize, parse_date) are evaluated once
+# per distinct value and mapped back through factorized codes, so their cost
+# depends on the column's cardinality, not on the number of rows.
+DEFAULT_RULES_PATH = Path(__file__).with_name('cleaning_rules.json')
+
+STRING_TRANSFORMS = {
+    'strip': str.strip,
+    'lower': str.lower,
+    'upper': str.upper,
+    'title': str.title,
+}
+
+
+def load_rules(rules_path=DEFAULT_RULES_PATH):
+    """Load and validate the rule list from a JSON spec"""
+    with open(rules_path) as f:
+        rules = json.load(f)['rules']
+    for rule in rules:
+        if rule.get('type') not in RULE_TYPES:
+            raise ValueError(f"Unknown cleaning rule type {rule.get('type')!r} in rule {rule.get('name')!r}")
+        for transform in rule.get('transforms', []):
+            if transform not in STRING_TRANSFORMS:
+                raise ValueError(f"Unknown transform {transform!r} in rule {rule['name']!r}")
+    return rules
+
+
+# ----------------------------
+# VALUE-LEVEL RULES (run on unique values)
+# ----------------------------
+def _map_uniques(series, func):
+    """Apply `func` to the distinct non-null values of `series`.
+
+    Returns the factorized codes of `series` (-1 for missing), the mapped
+    distinct values and the number of rows whose value changed.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    mapped = func(pd.Series(uniques, dtype=object))
+    changed = ~(mapped.astype(object) == pd.Series(uniques, dtype=object)).to_numpy()
+    rows_changed = int(np.bincount(codes[codes >= 0], minlength=len(uniques))[changed].sum()) if len(uniques) else 0
+    return codes, mapped, rows_changed
+
+
+def _take(values, codes, fill):
+    """values[codes] with -1 (missing) codes filled with `fill`"""
+    out = np.full(len(codes), fill, dtype=values.dtype)
+    valid = codes >= 0
+    out[valid] = values[codes[valid]]
+    return out
+
+
+def _parse_number(series, rule):
+    def parse(uniques):
+        text = uniques.astype(str)
+        for char in rule.get('strip', []):
+            text = text.str.replace(char, '', regex=False)
+        return pd.to_numeric(text.str.strip(), errors='coerce') / rule.get('divide_by', 1)
+
+    codes, parsed, rows_changed = _map_uniques(series, parse)
+    return _take(parsed.to_numpy(dtype='float64'), codes, np.nan), rows_changed
+
+
+def _normalize(series, rule):
+    transforms = [STRING_TRANSFORMS[t] for t in rule.get('transforms', [])]
+    mapping = rule.get('map', {})
+
+    def normalize(uniques):
+        out = []
+        for value in uniques.astype(str):
+            for transform in transforms:
+                value = transform(value)
+            out.append(mapping.get(value, value))
+        return pd.Series(out, dtype=object)
+
+    codes, normalized, rows_changed = _map_uniques(series, normalize)
+    # Several raw spellings can normalize to the same value ('m', ' Male'),
+    # so factorize again to get unique categories and remap the codes
+    new_codes, categories = pd.factorize(normalized)
+    final_codes = _take(new_codes, codes, -1)
+    return pd.Categorical.from_codes(final_codes, categories=categories), rows_changed
+
+
+def _parse_date(series, rule):
+    def parse(uniques):
+        return pd.Series(pd.to_datetime(uniques, errors='coerce', format=rule.get('format')))
+
+    codes, parsed, rows_changed = _map_uniques(series, parse)
+    return _take(parsed.to_numpy(dtype='datetime64[ns]'), codes, np.datetime64('NaT')), rows_changed
+
+
+# ----------------------------
+# ROW-LEVEL RULES
+# ----------------------------
+def _range_bounds(df, rule):
+    lower = df[rule['min_column']] if 'min_column' in rule else rule.get('min')
+    upper = df[rule['max_column']] if 'max_column' in rule else rule.get('max')
+    return lower, upper
+
+
+def apply_rule(df, rule):
+    """Apply a single rule; returns the new frame and a report entry"""
+    rule_type = rule['type']
+    report = {'rule': rule['name'], 'type': rule_type, 'rows_in': len(df), 'rows_dropped': 0, 'rows_changed': 0}
+
+    if rule_type in ('parse_number', 'normalize', 'parse_date'):
+        values, report['rows_changed'] = VALUE_RULES[rule_type](df[rule['column']], rule)
+        df[rule['column']] = values
+
+    elif rule_type == 'drop_missing':
+        keep = df[rule['columns']].notna().all(axis=1)
+        report['rows_dropped'] = int((~keep).sum())
+        df = df[keep].copy()
+
+    elif rule_type == 'range':
+        column = rule['column']
+        lower, upper = _range_bounds(df, rule)
+        below = df[column] < lower if lower is not None else pd.Series(False, index=df.index)
+        above = df[column] > upper if upper is not None else pd.Series(False, index=df.index)
+        invalid = below | above
+        action = rule.get('action', 'clip')
+        if action == 'clip':
+            if lower is not None:
+                df[column] = df[column].mask(below, lower)
+            if upper is not None:
+                df[column] = df[column].mask(above, upper)
+            report['rows_changed'] = int(invalid.sum())
+        elif action == 'null':
+            df[column] = df[column].mask(invalid)
+            report['rows_changed'] = int(invalid.sum())
+        elif action == 'drop':
+            report['rows_dropped'] = int(invalid.sum())
+            df = df[~invalid].copy()
+        else:
+            raise ValueError(f"Unknown range action {action!r} in rule {rule['name']!r}")
+
+    elif rule_type == 'derive':
+        df[rule['column']] = df.eval(rule['expr'])
+        report['rows_changed'] = len(df)
+
+    report['rows_out'] = len(df)
+    return df, report
+
+
+def apply_rules(df, rules):
+    """Run every rule in order; returns the cleaned frame and one report entry per rule"""
+    reports = []
+    for rule in rules:
+        df, report = apply_rule(df, rule)
+        reports.append(report)
+    return df, reports
+
+
+def merge_rule_reports(totals, reports):
+    """Sum per-rule row counts across chunks/files; `totals` may be empty"""
+    if not totals:
+        return [dict(report) for report in reports]
+    for total, report in zip(totals, reports):
+        for key in ('rows_in', 'rows_dropped', 'rows_changed', 'rows_out'):
+            total[key] += report[key]
+    return totals
+
+
+VALUE_RULES = {
+    'parse_number': _parse_number,
+    'normalize': _normalize,
+    'parse_date': _parse_date,
+}
+RULE_TYPES = set(VALUE_RULES) | {'drop_missing', 'range', 'derive'}
@@ -1,85 +1,747 @@
+import argparse
+import contextlib
+import glob
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 import pandas as pd
 import numpy as np
 from pathlib import Path
 
-# ----------------------------
-# LOAD RAW DATA
-# ----------------------------
-input_path = Path('Dataset/RawData/Mental_Health_Patients_Dataset_3000.xlsx')
-df = pd.read_excel(input_path)
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional; the CSV is always written
+    pa = pc = pq = None
 
-print("RAW DATA LOADED: Shape =", df.shape)
-print("\nFirst 5 rows:")
-print(df.head())
+from cleaning_rules import DEFAULT_RULES_PATH, apply_rules, load_rules, merge_rule_reports
+from data_profile import DatasetProfile, load_profile_state, save_profile_state, write_profile
+from kpi_cube import build_cube, load_cube, merge_cubes, write_cube
+from schema import CATEGORICAL_COLUMNS, COPY_READ_ERRORS, DATE_COLUMNS, FLOAT_COLUMNS, INTEGER_COLUMNS, apply_schema, print_memory_report
 
 # ----------------------------
-# STANDARDIZE COLUMNS
+# CONFIG
 # ----------------------------
-df.columns = [
-    'Patient_ID', 'Patient_Name', 'Age', 'Gender', 'City', 
-    'Registration_Date', 'Program_Type', 'Therapy_Type', 
-    'Total_Sessions_Assigned', 'Sessions_Attended', 
-    'Attendance_Rate', 'Provider_Name', 'Case_Status', 
+INPUT_PATH = Path('Dataset/RawData/Mental_Health_Patients_Dataset_3000.xlsx')
+OUTPUT_DIR = Path('Dataset/CleanedData')
+OUTPUT_PATH = OUTPUT_DIR / 'patients_master_clean.csv'
+
+COLUMNS = [
+    'Patient_ID', 'Patient_Name', 'Age', 'Gender', 'City',
+    'Registration_Date', 'Program_Type', 'Therapy_Type',
+    'Total_Sessions_Assigned', 'Sessions_Attended',
+    'Attendance_Rate', 'Provider_Name', 'Case_Status',
     'Risk_Level', 'Satisfaction_Score'
 ]
 
+# Cleaning steps, declared in cleaning_rules.json (see cleaning_rules.py)
+RULES = load_rules()
+
+DEFAULT_CHUNKSIZE = 100_000
+
+RAW_SUFFIXES = ('.xlsx', '.xls', '.csv')
+
+
+# ----------------------------
+# LOAD RAW DATA
+# ----------------------------
+def resolve_inputs(input_spec):
+    """Expand a raw file, a directory of per-site files or a glob into a sorted file list"""
+    input_path = Path(input_spec)
+    if input_path.is_dir():
+        candidates = input_path.iterdir()
+    elif input_path.exists():
+        candidates = [input_path]
+    else:
+        candidates = (Path(p) for p in glob.glob(str(input_spec)))
+    # Sorted so the merged output has the same row order on every run;
+    # '~$' files are Excel lock files, not data
+    paths = sorted(p for p in candidates
+                   if p.is_file() and p.suffix.lower() in RAW_SUFFIXES and not p.name.startswith('~$'))
+    if not paths:
+        raise FileNotFoundError(f"No raw .xlsx/.csv files found for {input_spec}")
+    return paths
+
+
+def read_raw(input_path):
+    """Read a whole raw workbook/CSV into memory"""
+    input_path = Path(input_path)
+    if input_path.suffix.lower() == '.csv':
+        return pd.read_csv(input_path)
+    return pd.read_excel(input_path)
+
+
+def iter_raw_chunks(input_path, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield the raw workbook/CSV as DataFrames of at most `chunksize` rows"""
+    input_path = Path(input_path)
+    if input_path.suffix.lower() == '.csv':
+        yield from pd.read_csv(input_path, chunksize=chunksize)
+        return
+
+    # openpyxl's read-only mode streams rows from the sheet XML instead of
+    # building the whole workbook, which is what pd.read_excel does
+    from openpyxl import load_workbook
+    wb = load_workbook(input_path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunksize:
+                yield pd.DataFrame(batch, columns=header)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        wb.close()
+
+
+def iter_input_chunks(input_paths, chunksize=DEFAULT_CHUNKSIZE):
+    """Chunks of every raw file in turn, in file order"""
+    for input_path in input_paths:
+        yield from iter_raw_chunks(input_path, chunksize)
+
+
 # ----------------------------
 # DATA CLEANING
 # ----------------------------
-print("\n=== CLEANING STARTED ===")
+def clean_frame(df, rules=None):
+    """Standardize one raw frame (whole file or a chunk).
+
+    The steps themselves (attendance parsing, Case_Status/Gender/City
+    normalization, date parsing, required fields, session capping and the
+    derived attendance rate) are declared in cleaning_rules.json. Returns the
+    cleaned rows and one report entry per rule (rows dropped/changed).
+    """
+    # STANDARDIZE COLUMNS
+    df.columns = COLUMNS
+    return apply_rules(df, RULES if rules is None else rules)
+
+
+def clean_file(input_path, rules=None):
+    """Read and clean one raw file; runs inside a worker process in multi-file mode"""
+    df = read_raw(input_path)
+    df_clean, rule_reports = clean_frame(df, rules)
+    stats = {
+        'rows': len(df),
+        'missing_age': int(df['Age'].isna().sum()),
+        'missing_sessions': int(df['Sessions_Attended'].isna().sum()),
+        'rules': rule_reports,
+    }
+    return df_clean, stats
+
+
+def clean_files(input_paths, workers=None, rules=None):
+    """Clean several raw files concurrently and merge them in input order.
+
+    Excel parsing is CPU-bound and single-threaded, so each file goes to its
+    own process. `executor.map` yields results in submission order, which
+    keeps the merged row order deterministic regardless of which file
+    finishes first.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(input_paths))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(clean_file, input_paths, repeat(rules)))
+
+    for input_path, (df_clean, stats) in zip(input_paths, results):
+        print(f"  {input_path.name}: {stats['rows']:,} rows in, {len(df_clean):,} rows out")
+    df_clean = pd.concat([df_clean for df_clean, _ in results], ignore_index=True)
+    totals = {key: sum(stats[key] for _, stats in results) for key in ('rows', 'missing_age', 'missing_sessions')}
+    totals['rules'] = []
+    for _, stats in results:
+        totals['rules'] = merge_rule_reports(totals['rules'], stats['rules'])
+    return df_clean, totals
+
+
+# ----------------------------
+# TYPED (PARQUET) OUTPUT
+# ----------------------------
+def parquet_path_for(output_path):
+    """Typed Parquet file written next to the cleaned CSV"""
+    return Path(output_path).with_suffix('.parquet')
 
-# 1. Fix Attendance Rate (remove % symbol, convert to decimal)
-df['Attendance_Rate'] = df['Attendance_Rate'].astype(str).str.replace('%', '', regex=False).str.strip()
-df['Attendance_Rate'] = pd.to_numeric(df['Attendance_Rate'], errors='coerce') / 100
 
-# 2. Standardize Case Status
-df['Case_Status'] = df['Case_Status'].astype(str).str.strip().str.title()
-df['Case_Status'] = df['Case_Status'].replace({
-    'Inprogress': 'In Progress', 'Activecase': 'Active'
-})
+def parquet_schema():
+    """Fixed Arrow schema (the compact types from schema.py) so every chunk/run writes identical column types.
 
-# 3. Standardize Gender
-df['Gender'] = df['Gender'].astype(str).str.strip().str.title()
-df['Gender'] = df['Gender'].replace({'Othergender': 'Other', 'F': 'Female', 'M': 'Male'})
+    The range rules in cleaning_rules.json keep the integer columns within
+    these types; a value outside them makes the typed write fail.
+    """
+    columns = []
+    for col in COLUMNS + ['Attendance_Rate_Fixed']:
+        if col in CATEGORICAL_COLUMNS:
+            columns.append(pa.field(col, pa.dictionary(pa.int32(), pa.string())))
+        elif col in DATE_COLUMNS:
+            columns.append(pa.field(col, pa.timestamp('ns')))
+        elif col in INTEGER_COLUMNS:
+            columns.append(pa.field(col, pa.from_numpy_dtype(np.dtype(INTEGER_COLUMNS[col]))))
+        elif col in FLOAT_COLUMNS:
+            columns.append(pa.field(col, pa.float32()))
+        else:
+            columns.append(pa.field(col, pa.string()))
+    return pa.schema(columns)
 
-# 4. Fix City names
-df['City'] = df['City'].astype(str).str.strip().str.title()
 
-# 5. Convert dates
-df['Registration_Date'] = pd.to_datetime(df['Registration_Date'], errors='coerce')
+def to_arrow(df_clean):
+    """Convert cleaned rows to an Arrow table with the compact schema"""
+    return pa.Table.from_pandas(apply_schema(df_clean), schema=parquet_schema(), preserve_index=False)
 
-# 6. Remove null rows (Age, Sessions critical)
-df_clean = df.dropna(subset=['Age', 'Total_Sessions_Assigned', 'Sessions_Attended'])
 
-# 7. Fix negative sessions (data error)
-df_clean.loc[df_clean['Sessions_Attended'] > df_clean['Total_Sessions_Assigned'], 
-             'Sessions_Attended'] = df_clean['Total_Sessions_Assigned']
+def write_parquet(df_clean, output_path):
+    """Write the typed Parquet copy of the cleaned data (skipped without pyarrow)"""
+    if pa is None:
+        print("⚠️ pyarrow not installed, skipping Parquet output")
+        return None
+    parquet_path = parquet_path_for(output_path)
+    pq.write_table(to_arrow(df_clean), parquet_path)
+    print(f"✅ TYPED DATA SAVED: {parquet_path}")
+    return parquet_path
 
-# 8. Recalculate attendance if invalid
-df_clean['Attendance_Rate_Fixed'] = df_clean['Sessions_Attended'] / df_clean['Total_Sessions_Assigned']
 
 # ----------------------------
-# CLEANING SUMMARY
+# MEMORY-MAPPABLE (ARROW IPC) OUTPUT
 # ----------------------------
-print("\nCLEANING SUMMARY:")
-print(f"Rows before: {len(df)}, after: {len(df_clean)}")
-print(f"Missing Age: {df['Age'].isna().sum()}, Sessions: {df['Sessions_Attended'].isna().sum()}")
+def arrow_path_for(output_path):
+    """Arrow IPC (Feather v2) file written next to the cleaned CSV"""
+    return Path(output_path).with_suffix('.arrow')
+
+
+def arrow_schema():
+    """parquet_schema() with 64-bit string offsets, the layout pandas' Arrow-backed strings use as is"""
+    return pa.schema([pa.field(field.name, pa.large_string()) if field.type == pa.string() else field
+                      for field in parquet_schema()])
+
+
+class ArrowWriter:
+    """Uncompressed Arrow IPC file of cleaned rows, written one chunk at a time.
+
+    The dashboard memory-maps this file instead of reading it, so it stays
+    uncompressed. An IPC file holds one dictionary per categorical column,
+    which later batches may only extend: each chunk is re-encoded against
+    the categories seen so far, with its new ones appended. The file is
+    written under a temporary name and moved into place on close, so
+    processes still mapping the previous version keep reading intact pages.
+    """
+
+    def __init__(self, output_path):
+        self.path = arrow_path_for(output_path)
+        self._tmp_path = self.path.with_suffix('.arrow.tmp')
+        self._schema = arrow_schema()
+        self._categories = {}
+        self._writer = pa.ipc.new_file(self._tmp_path, self._schema,
+                                       options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+
+    def write(self, df_clean):
+        df = apply_schema(df_clean)
+        for col in CATEGORICAL_COLUMNS:
+            if col in df.columns:
+                known = self._categories.get(col)
+                categories = df[col].cat.categories
+                if known is not None:
+                    categories = known.append(categories.difference(known))
+                    df[col] = df[col].cat.set_categories(categories)
+                self._categories[col] = categories
+        self._writer.write_table(pa.Table.from_pandas(df, schema=self._schema, preserve_index=False))
+
+    def copy_batches(self, reader):
+        """Write every batch of an existing Arrow copy unchanged (no pandas round trip); later chunks extend its categories"""
+        batch = None
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            self._writer.write_batch(batch)
+        if batch is not None:
+            for col in CATEGORICAL_COLUMNS:
+                if col in batch.schema.names:
+                    self._categories[col] = pd.Index(batch.column(col).dictionary.to_pylist())
+
+    def close(self):
+        self._writer.close()
+        self._tmp_path.replace(self.path)
+
+    def abort(self):
+        """Drop the partial file, leaving any previous version in place"""
+        self._writer.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_arrow(df_clean, output_path):
+    """Write the memory-mappable Arrow copy of the cleaned data in one batch (skipped without pyarrow)"""
+    if pa is None:
+        return None
+    with ArrowWriter(output_path) as writer:
+        writer.write(df_clean)
+    print(f"✅ MAPPED DATA SAVED: {writer.path}")
+    return writer.path
+
+
+# ----------------------------
+# SUMMARY (from the data-quality profile)
+# ----------------------------
+def print_cleaning_summary(profile, rows_before, missing_age, missing_sessions, rule_reports):
+    print("\nCLEANING SUMMARY:")
+    print(f"Rows before: {rows_before}, after: {profile.rows}")
+    print(f"Missing Age: {missing_age}, Sessions: {missing_sessions}")
+    for report in rule_reports:
+        if report['rows_dropped']:
+            print(f"  {report['rule']}: {report['rows_dropped']} rows dropped")
+
+
+def print_quick_stats(profile):
+    columns = profile.to_dict()['columns']
+    print("\n📊 CLEAN DATA STATS:")
+    print(f"Total Patients: {profile.rows}")
+    if 'mean' in columns.get('Age', {}):
+        print(f"Avg Age: {columns['Age']['mean']:.1f}")
+    if 'mean' in columns.get('Attendance_Rate_Fixed', {}):
+        print(f"Avg Attendance: {columns['Attendance_Rate_Fixed']['mean']:.1%}")
+    status_counts = profile.columns['Case_Status'].counts
+    if status_counts is not None:
+        print(f"Case Status: {status_counts.sort_values(ascending=False, kind='stable').astype(int).to_dict()}")
+
 
 # ----------------------------
-# SAVE CLEAN DATA
+# CHUNKED OUTPUT
 # ----------------------------
-output_dir = Path('Dataset/CleanedData')
-output_dir.mkdir(parents=True, exist_ok=True)  # create folder if not exists
+def write_clean_chunks(chunks, output_path):
+    """Write cleaned frames from `chunks` to the CSV and its Parquet and Arrow copies, one at a time.
+
+    Shared by the streaming cleaner and the synthetic data generator. The
+    profile and KPI cube are accumulated on the way and returned as
+    (profile, cube) for the caller to write; cube is None without rows.
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)  # create folder if not exists
+    if output_path.exists():
+        output_path.unlink()  # chunks are appended, so start from an empty file
+
+    parquet_writer = arrow_writer = None
+    if pa is not None:
+        parquet_writer = pq.ParquetWriter(parquet_path_for(output_path), parquet_schema())
+        arrow_writer = ArrowWriter(output_path)
+    else:
+        print("⚠️ pyarrow not installed, skipping Parquet and Arrow output")
+
+    profile = DatasetProfile()
+    cube = None
+    try:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(output_path, mode='a', header=(i == 0), index=False)
+            if parquet_writer is not None:
+                parquet_writer.write_table(to_arrow(chunk))
+                arrow_writer.write(chunk)
+            profile.update(chunk)
+            # Folding each chunk in keeps the cube at one row per dimension combination
+            cube = merge_cubes([cube, build_cube(chunk)])
+    except BaseException:
+        if arrow_writer is not None:
+            arrow_writer.abort()
+        raise
+    finally:
+        if parquet_writer is not None:
+            parquet_writer.close()
+    if arrow_writer is not None:
+        arrow_writer.close()
+        print(f"✅ TYPED DATA SAVED: {parquet_path_for(output_path)}")
+        print(f"✅ MAPPED DATA SAVED: {arrow_writer.path}")
+    return profile, cube
 
-output_path = output_dir / 'patients_master_clean.csv'
-df_clean.to_csv(output_path, index=False)
-print(f"\n✅ CLEAN DATA SAVED: {output_path}")
 
 # ----------------------------
-# QUICK STATS FOR VALIDATION
+# PIPELINES
 # ----------------------------
-print("\n📊 CLEAN DATA STATS:")
-print(f"Total Patients: {len(df_clean)}")
-print(f"Avg Age: {df_clean['Age'].mean():.1f}")
-print(f"Avg Attendance: {df_clean['Attendance_Rate_Fixed'].mean():.1%}")
-print(f"Case Status: {df_clean['Case_Status'].value_counts().to_dict()}")
+def run_full(input_path=INPUT_PATH, output_path=OUTPUT_PATH, workers=None, rules=None):
+    """Original in-memory pipeline: read everything, clean, write once.
+
+    `input_path` may also be a directory or glob of per-site files, which are
+    cleaned in parallel across `workers` processes and merged in file order.
+    """
+    input_paths = resolve_inputs(input_path)
+    if len(input_paths) == 1:
+        df = read_raw(input_paths[0])
+
+        print("RAW DATA LOADED: Shape =", df.shape)
+        print("\nFirst 5 rows:")
+        print(df.head())
+
+        print("\n=== CLEANING STARTED ===")
+        df_clean, rule_reports = clean_frame(df, rules)
+        rows_before = len(df)
+        missing_age, missing_sessions = df['Age'].isna().sum(), df['Sessions_Attended'].isna().sum()
+    else:
+        print(f"=== CLEANING {len(input_paths)} FILES IN PARALLEL ===")
+        df_clean, totals = clean_files(input_paths, workers, rules)
+        rows_before, rule_reports = totals['rows'], totals['rules']
+        missing_age, missing_sessions = totals['missing_age'], totals['missing_sessions']
+
+    # ----------------------------
+    # CLEANING SUMMARY
+    # ----------------------------
+    profile = DatasetProfile().update(df_clean)
+    print_cleaning_summary(profile, rows_before, missing_age, missing_sessions, rule_reports)
+    print_memory_report(df_clean, apply_schema(df_clean), 'cleaned frame')
+
+    # ----------------------------
+    # SAVE CLEAN DATA
+    # ----------------------------
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)  # create folder if not exists
+
+    df_clean.to_csv(output_path, index=False)
+    print(f"\n✅ CLEAN DATA SAVED: {output_path}")
+    write_parquet(df_clean, output_path)
+    write_arrow(df_clean, output_path)
+    profile_path = write_profile(profile, output_path, rows_before, rule_reports, input_paths)
+    print(f"✅ DATA PROFILE SAVED: {profile_path}")
+    cube_path = write_cube(build_cube(df_clean), output_path)
+    print(f"✅ KPI CUBE SAVED: {cube_path}")
+
+    # ----------------------------
+    # QUICK STATS FOR VALIDATION
+    # ----------------------------
+    print_quick_stats(profile)
+    return df_clean
+
+
+def run_streaming(input_path=INPUT_PATH, output_path=OUTPUT_PATH, chunksize=DEFAULT_CHUNKSIZE, rules=None):
+    """Chunked pipeline: clean `chunksize` rows at a time and append to the output.
+
+    Only one chunk is held in memory at once, so peak memory depends on
+    `chunksize` and not on the size of the raw extract. Summary stats are
+    accumulated chunk by chunk in the data-quality profile instead of being
+    computed on a full frame.
+    """
+    print(f"=== STREAMING CLEAN STARTED (chunksize={chunksize:,}) ===")
+    input_paths = resolve_inputs(input_path)
+    stats = {'rows': 0, 'missing_age': 0, 'missing_sessions': 0, 'rules': []}
+
+    def cleaned_chunks():
+        for i, chunk in enumerate(iter_input_chunks(input_paths, chunksize)):
+            stats['rows'] += len(chunk)
+            chunk_clean, chunk_reports = clean_frame(chunk, rules)
+            stats['rules'] = merge_rule_reports(stats['rules'], chunk_reports)
+            stats['missing_age'] += int(chunk['Age'].isna().sum())
+            stats['missing_sessions'] += int(chunk['Sessions_Attended'].isna().sum())
+            print(f"  chunk {i + 1}: {len(chunk):,} rows in, {len(chunk_clean):,} rows out")
+            yield chunk_clean
+
+    profile, cube = write_clean_chunks(cleaned_chunks(), output_path)
+
+    # ----------------------------
+    # CLEANING SUMMARY
+    # ----------------------------
+    print_cleaning_summary(profile, stats['rows'], stats['missing_age'], stats['missing_sessions'], stats['rules'])
+    print(f"\n✅ CLEAN DATA SAVED: {output_path}")
+    profile_path = write_profile(profile, output_path, stats['rows'], stats['rules'], input_paths)
+    print(f"✅ DATA PROFILE SAVED: {profile_path}")
+    if cube is not None:
+        print(f"✅ KPI CUBE SAVED: {write_cube(cube, output_path)}")
+
+    # ----------------------------
+    # QUICK STATS FOR VALIDATION
+    # ----------------------------
+    print_quick_stats(profile)
+
+
+# ----------------------------
+# INCREMENTAL (DELTA) CLEANING
+# ----------------------------
+def manifest_path_for(output_path):
+    """Manifest of already-cleaned rows, kept next to the cleaned CSV"""
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.stem + '_manifest.json')
+
+
+def file_sha256(path, block_size=1 << 20):
+    """Hash the raw file so an unchanged extract can be skipped without parsing it"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(manifest_path):
+    manifest_path = Path(manifest_path)
+    if not manifest_path.exists():
+        return None
+    with open(manifest_path) as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, manifest_path):
+    tmp_path = Path(manifest_path).with_suffix('.tmp')
+    # json.dumps encodes in one C call; json.dump streams through the
+    # pure-Python encoder, which is much slower on millions of patients
+    with open(tmp_path, 'w') as f:
+        f.write(json.dumps(manifest))
+    tmp_path.replace(manifest_path)
+
+
+def canonical_text(values):
+    """Each value as dtype-independent text: 30 and 30.0 both become '30', missing becomes ''"""
+    text = values.astype(str)
+    if pd.api.types.is_float_dtype(values):
+        # A missing value turns a chunk's int column into float; render
+        # whole numbers the same either way
+        integral = (values % 1 == 0) & (values.abs() < 2 ** 53)
+        text[integral] = values[integral].astype('int64').astype(str)
+    return text.mask(values.isna(), '')
+
+
+def row_hashes(df):
+    """Content hash of each raw row, used to detect changed patients.
+
+    Hashed as text so a row's hash doesn't depend on the dtypes pandas
+    inferred for the rest of its chunk.
+    """
+    text = pd.DataFrame({column: canonical_text(df[column]) for column in df.columns})
+    return pd.util.hash_pandas_object(text, index=False).to_numpy().astype(str)
+
+
+def remove_patients_csv(output_path, patient_ids, chunksize=DEFAULT_CHUNKSIZE):
+    """Rewrite the cleaned CSV without `patient_ids`, one chunk at a time"""
+    output_path = Path(output_path)
+    tmp_path = output_path.with_suffix('.csv.tmp')
+    # Read as text so untouched rows are written back byte-for-byte
+    chunks = pd.read_csv(output_path, chunksize=chunksize, dtype=str, keep_default_na=False)
+    for i, chunk in enumerate(chunks):
+        chunk = chunk[~chunk['Patient_ID'].isin(patient_ids)]
+        chunk.to_csv(tmp_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+    tmp_path.replace(output_path)
+
+
+def merge_parquet(output_path, delta_clean, replaced_ids, chunksize=DEFAULT_CHUNKSIZE):
+    """Merge cleaned delta rows into the typed Parquet copy, replacing changed patients"""
+    if pa is None:
+        return
+    parquet_path = parquet_path_for(output_path)
+    tmp_path = parquet_path.with_suffix('.parquet.tmp')
+    with pq.ParquetWriter(tmp_path, parquet_schema()) as writer:
+        if parquet_path.exists():
+            for batch in pq.ParquetFile(parquet_path).iter_batches(batch_size=chunksize):
+                table = pa.Table.from_batches([batch])
+                if replaced_ids:
+                    keep = pc.invert(pc.is_in(table['Patient_ID'], value_set=pa.array(sorted(replaced_ids))))
+                    table = table.filter(keep)
+                writer.write_table(table)
+        else:
+            # No typed copy yet: build it from the already-merged CSV
+            for chunk in pd.read_csv(output_path, chunksize=chunksize, parse_dates=['Registration_Date']):
+                writer.write_table(to_arrow(chunk[~chunk['Patient_ID'].isin(delta_clean['Patient_ID'])]))
+        writer.write_table(to_arrow(delta_clean))
+    tmp_path.replace(parquet_path)
+    print(f"✅ TYPED DATA SAVED: {parquet_path}")
+
+
+def append_arrow(output_path, delta_clean):
+    """Append new cleaned rows to the Arrow copy; False if there is no current copy to extend.
+
+    The existing batches are copied as they are and the delta becomes one
+    more batch, so nothing already written is converted again.
+    """
+    arrow_path = arrow_path_for(output_path)
+    if pa is None or not arrow_path.exists():
+        return False
+    with pa.memory_map(str(arrow_path)) as source:
+        try:
+            reader = pa.ipc.open_file(source)
+        except COPY_READ_ERRORS:
+            return False
+        if not reader.schema.equals(arrow_schema()):
+            return False
+        with ArrowWriter(output_path) as writer:
+            writer.copy_batches(reader)
+            writer.write(delta_clean)
+    print(f"✅ MAPPED DATA SAVED: {writer.path}")
+    return True
+
+
+def iter_clean_chunks(output_path, chunksize=DEFAULT_CHUNKSIZE):
+    """Read the cleaned output back in chunks, typed Parquet first"""
+    parquet_path = parquet_path_for(output_path)
+    if pq is not None and parquet_path.exists():
+        for batch in pq.ParquetFile(parquet_path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(output_path, chunksize=chunksize, parse_dates=['Registration_Date'])
+
+
+def run_incremental(input_path=INPUT_PATH, output_path=OUTPUT_PATH, chunksize=DEFAULT_CHUNKSIZE, rules=None):
+    """Clean only new or changed patients and merge them into the existing output.
+
+    The manifest next to the cleaned CSV records the raw file hash, a content
+    hash per processed Patient_ID and the latest Registration_Date seen. An
+    unchanged raw file is skipped outright; otherwise the raw rows are scanned
+    in chunks and only rows with an unseen Patient_ID or a different content
+    hash are cleaned. The watermark is reported, not used to skip rows: a
+    corrected row can carry any Registration_Date.
+
+    New patients are appended to the CSV and, as one more batch, to the Arrow
+    copy, and folded into the saved profile and KPI cube, so updating those
+    costs about the size of the delta; the raw rows are still read and hashed
+    in full to find it. Parquet files can't be appended to, so the typed
+    copy's row groups are still copied over. Changed patients replace their
+    previous cleaned row, which rewrites the outputs.
+    """
+    input_paths, output_path = resolve_inputs(input_path), Path(output_path)
+    manifest_path = manifest_path_for(output_path)
+    if len(input_paths) == 1:
+        raw_sha256 = file_sha256(input_paths[0])
+    else:
+        # Any added, removed or modified site file changes the combined hash
+        raw_sha256 = hashlib.sha256(
+            ''.join(f"{p.name}:{file_sha256(p)};" for p in input_paths).encode()
+        ).hexdigest()
+
+    manifest = load_manifest(manifest_path)
+    fresh = manifest is None or not output_path.exists()
+    if fresh:
+        print("=== INCREMENTAL CLEAN: no manifest/output yet, cleaning every row ===")
+        manifest = {'raw_sha256': None, 'watermark': None, 'patients': {}}
+    elif manifest['raw_sha256'] == raw_sha256:
+        print(f"✅ {', '.join(p.name for p in input_paths)} unchanged since last run, nothing to clean")
+        return
+    else:
+        print(f"=== INCREMENTAL CLEAN STARTED (watermark={manifest['watermark']}) ===")
+
+    patients = manifest['patients']
+    seen_hashes = pd.Series(patients, dtype=object)
+    watermark = pd.Timestamp(manifest['watermark']) if manifest['watermark'] else None
+    new_watermark = watermark
+
+    rows_scanned = past_watermark = 0
+    new_ids, changed_ids = set(), set()
+    delta_parts, rule_reports = [], []
+    for chunk in iter_input_chunks(input_paths, chunksize):
+        chunk.columns = COLUMNS
+        rows_scanned += len(chunk)
+
+        ids = chunk['Patient_ID'].astype(str)
+        hashes = row_hashes(chunk)
+        previous = ids.map(seen_hashes)
+        is_new = previous.isna().to_numpy()
+        is_changed = ~is_new & (previous.to_numpy() != hashes)
+        delta = is_new | is_changed
+
+        dates = pd.to_datetime(chunk['Registration_Date'], errors='coerce')
+        if watermark is not None:
+            past_watermark += int((dates > watermark).sum())
+        if dates.notna().any() and (new_watermark is None or dates.max() > new_watermark):
+            new_watermark = dates.max()
+
+        if delta.any():
+            new_ids.update(ids[is_new])
+            changed_ids.update(ids[is_changed])
+            patients.update(zip(ids[delta], hashes[delta]))
+            delta_clean, delta_reports = clean_frame(chunk[delta].copy(), rules)
+            delta_parts.append(delta_clean)
+            rule_reports = merge_rule_reports(rule_reports, delta_reports)
+
+    manifest['raw_sha256'] = raw_sha256
+    manifest['watermark'] = None if new_watermark is None else new_watermark.isoformat()
+
+    print(f"Rows scanned: {rows_scanned}, new patients: {len(new_ids)}, changed patients: {len(changed_ids)}")
+    if watermark is not None:
+        print(f"Rows registered after watermark {watermark.date()}: {past_watermark}")
+
+    if not delta_parts:
+        save_manifest(manifest, manifest_path)
+        print("✅ No new or changed rows, cleaned output already up to date")
+        return
+
+    delta_clean = pd.concat(delta_parts, ignore_index=True)
+    # An append-only delta is folded into the saved profile and cube; replaced
+    # patients (or no saved state) mean rescanning the merged output below
+    profile = cube = None
+    if fresh:
+        profile = DatasetProfile()
+    elif not changed_ids:
+        profile, cube = load_profile_state(output_path), load_cube(output_path)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)  # create folder if not exists
+    if fresh:
+        delta_clean.to_csv(output_path, index=False)
+        write_parquet(delta_clean, output_path)
+    else:
+        if changed_ids:
+            remove_patients_csv(output_path, changed_ids, chunksize)
+        delta_clean.to_csv(output_path, mode='a', header=False, index=False)
+        merge_parquet(output_path, delta_clean, changed_ids, chunksize)
+
+    save_manifest(manifest, manifest_path)
+    print(f"\n✅ CLEAN DATA MERGED: {len(delta_clean)} rows into {output_path}")
+    print(f"✅ MANIFEST SAVED: {manifest_path}")
+
+    # The profile, cube and Arrow copy cover the whole merged output; rule
+    # counts cover this delta
+    if fresh:
+        write_arrow(delta_clean, output_path)
+        appended = True
+    else:
+        appended = profile is not None and cube is not None and (pa is None or append_arrow(output_path, delta_clean))
+    if appended:
+        # In the typed copy's dtypes, like the chunks a rescan reads back
+        typed_delta = apply_schema(delta_clean)
+        profile.update(typed_delta)
+        cube = merge_cubes([cube, build_cube(typed_delta)])
+    else:
+        profile, cube = DatasetProfile(), None
+        with (ArrowWriter(output_path) if pa is not None else contextlib.nullcontext()) as arrow_writer:
+            for chunk in iter_clean_chunks(output_path, chunksize):
+                profile.update(chunk)
+                cube = merge_cubes([cube, build_cube(chunk)])
+                if arrow_writer is not None:
+                    arrow_writer.write(chunk)
+        if arrow_writer is not None:
+            print(f"✅ MAPPED DATA SAVED: {arrow_writer.path}")
+    profile_path = write_profile(profile, output_path, rows_scanned, rule_reports, input_paths)
+    save_profile_state(profile, output_path)
+    print(f"✅ DATA PROFILE SAVED: {profile_path}")
+    if cube is not None:
+        print(f"✅ KPI CUBE SAVED: {write_cube(cube, output_path)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clean the raw mental health patients extract")
+    parser.add_argument('--input', default=str(INPUT_PATH),
+                        help="raw .xlsx/.csv file, or a directory/glob of per-site raw files")
+    parser.add_argument('--output', default=str(OUTPUT_PATH), help="cleaned CSV to write (typed .parquet and .arrow copies and a KPI cube are written alongside)")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--stream', action='store_true',
+                      help="clean in fixed-size chunks with constant memory (for large extracts)")
+    mode.add_argument('--incremental', action='store_true',
+                      help="clean only new/changed Patient_IDs and merge them into the existing output")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                        help=f"rows per chunk in --stream/--incremental mode (default {DEFAULT_CHUNKSIZE:,})")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processes used to clean multiple raw files (default: all CPU cores)")
+    parser.add_argument('--rules', default=str(DEFAULT_RULES_PATH),
+                        help="JSON cleaning rule spec (default: cleaning_rules.json)")
+    args = parser.parse_args()
+    rules = load_rules(args.rules)
+
+    if args.incremental:
+        run_incremental(args.input, args.output, args.chunksize, rules)
+    elif args.stream:
+        run_streaming(args.input, args.output, args.chunksize, rules)
+    else:
+        run_full(args.input, args.output, args.workers, rules)
+
+
+if __name__ == '__main__':
+    main()
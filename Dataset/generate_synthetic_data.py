@@ -0,0 +1,245 @@
+"""Deterministic synthetic patients in the cleaned (patients_master_clean) schema.
+
+Generates 1M-100M+ rows for load tests, one fixed-size chunk at a time,
+fully vectorized in NumPy. Chunk i is drawn from its own
+SeedSequence(seed, spawn_key=(i,)) stream, so the output depends only on
+--seed and --chunk-rows, never on --workers or on which chunks ran where.
+
+    python Dataset/generate_synthetic_data.py --rows 100000000 --output Dataset/SyntheticData/patients
+    python Dataset/generate_synthetic_data.py --rows 5000000 --output Dataset/SyntheticData/patients_master_clean.csv
+
+An --output directory gets one part file per chunk (part-00000.parquet, ...),
+written in parallel. A .csv output is written chunk by chunk as one file,
+with the typed .parquet and memory-mappable .arrow copies, data profile and
+KPI cube next to it, exactly like data_cleaning.py --stream, so the
+dashboard can open it directly (DASHBOARD_DATA_PATH). Make --chunk-rows at
+least --rows for a single-batch .arrow, whose numeric columns the dashboard
+maps without copying.
+
+Beyond the real dataset's cardinalities, the draws carry the relationships
+the dashboard charts are about:
+- providers have skewed (Zipf-like) caseloads
+- the therapy mix and Risk_Level depend on Program_Type
+- attendance falls with Risk_Level; Case_Status and Satisfaction_Score
+  follow attendance
+- registrations are seasonal (a January peak, a summer dip)
+"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_cleaning import COLUMNS, pa, pq, to_arrow, write_clean_chunks
+from data_profile import write_profile
+from kpi_cube import write_cube
+
+# ----------------------------
+# CONFIG
+# ----------------------------
+OUTPUT_DIR = Path('Dataset/SyntheticData')
+
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+OUTPUT_COLUMNS = COLUMNS + ['Attendance_Rate_Fixed']
+
+GENDERS = ['Female', 'Male', 'Other']
+CITIES = ['Bangalore', 'Chennai', 'Delhi', 'Hyderabad', 'Kolkata', 'Mumbai', 'Nagpur', 'Pune']
+CITY_WEIGHTS = [0.130, 0.123, 0.123, 0.131, 0.114, 0.123, 0.124, 0.132]
+PROGRAMS = ['Psychiatric Care', 'Substance Use Treatment', 'Therapy & Counseling']
+PROGRAM_WEIGHTS = [0.33, 0.345, 0.325]
+THERAPIES = ['CBT', 'DBT', 'Family Therapy', 'Group Therapy', 'Mindfulness Therapy', 'Trauma Counseling']
+RISK_LEVELS = ['Low', 'Moderate', 'High']
+CASE_STATUSES = ['Active', 'Completed', 'Dropped', 'In Progress']
+
+# P(therapy | program), rows in PROGRAMS order
+THERAPY_BY_PROGRAM = [
+    [0.22, 0.22, 0.10, 0.12, 0.14, 0.20],
+    [0.18, 0.12, 0.18, 0.30, 0.12, 0.10],
+    [0.20, 0.14, 0.20, 0.12, 0.22, 0.12],
+]
+
+# P(risk level | program)
+RISK_BY_PROGRAM = [
+    [0.20, 0.35, 0.45],
+    [0.25, 0.40, 0.35],
+    [0.50, 0.33, 0.17],
+]
+
+# Mean attendance rate per risk level; each patient's own rate is drawn
+# from a Beta around it
+ATTENDANCE_BY_RISK = [0.60, 0.45, 0.30]
+ATTENDANCE_CONCENTRATION = 6.0
+
+# P(case status | attendance band): below 30%, 30-60%, above 60%
+STATUS_BY_ATTENDANCE = [
+    [0.25, 0.10, 0.40, 0.25],
+    [0.28, 0.25, 0.20, 0.27],
+    [0.25, 0.45, 0.05, 0.25],
+]
+ATTENDANCE_BANDS = [0.3, 0.6]
+
+# Registrations per month relative to the yearly mean (January first)
+SEASONALITY = [1.25, 1.10, 1.05, 1.00, 0.95, 0.85, 0.80, 0.85, 1.00, 1.05, 1.05, 1.05]
+FIRST_DATE = '2023-01-01'
+LAST_DATE = '2024-12-31'
+
+DEFAULT_PROVIDERS = 49
+PROVIDER_SKEW = 0.8
+
+
+# ----------------------------
+# DISTRIBUTIONS
+# ----------------------------
+def provider_weights(n_providers, seed):
+    """Zipf-like caseload shares, assigned to providers in a seeded random order"""
+    shares = 1.0 / np.arange(1, n_providers + 1) ** PROVIDER_SKEW
+    shares = np.random.default_rng(np.random.SeedSequence(seed)).permutation(shares)
+    return shares / shares.sum()
+
+
+def day_weights():
+    """Registration probability of each day in [FIRST_DATE, LAST_DATE]"""
+    days = np.arange(np.datetime64(FIRST_DATE), np.datetime64(LAST_DATE) + 1)
+    months = days.astype('datetime64[M]').astype(np.int64) % 12
+    weights = np.asarray(SEASONALITY)[months]
+    return days, weights / weights.sum()
+
+
+def conditional_choice(rng, table, given):
+    """One draw per row from the row of `table` (probabilities) picked by `given`"""
+    cumulative = np.cumsum(np.asarray(table, dtype='float64'), axis=1)
+    cumulative[:, -1] = 1.0
+    u = rng.random(len(given))
+    return (u[:, None] >= cumulative[given]).sum(axis=1)
+
+
+def categorical(codes, categories):
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+# ----------------------------
+# GENERATION
+# ----------------------------
+def generate_chunk(chunk_index, chunk_rows, total_rows, seed=42, n_providers=DEFAULT_PROVIDERS):
+    """Rows [chunk_index * chunk_rows, ...) of the dataset as a cleaned-schema frame"""
+    start = chunk_index * chunk_rows
+    n = min(chunk_rows, total_rows - start)
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(chunk_index,)))
+    numbers = np.arange(start + 1, start + n + 1)
+
+    program = rng.choice(len(PROGRAMS), n, p=PROGRAM_WEIGHTS)
+    therapy = conditional_choice(rng, THERAPY_BY_PROGRAM, program)
+    risk = conditional_choice(rng, RISK_BY_PROGRAM, program)
+
+    total = rng.integers(1, 25, n)
+    mean_rate = np.asarray(ATTENDANCE_BY_RISK)[risk]
+    rate = rng.beta(mean_rate * ATTENDANCE_CONCENTRATION, (1 - mean_rate) * ATTENDANCE_CONCENTRATION)
+    attended = rng.binomial(total, rate)
+    attendance = attended / total
+
+    status = conditional_choice(rng, STATUS_BY_ATTENDANCE, np.searchsorted(ATTENDANCE_BANDS, attendance, side='right'))
+    satisfaction = np.clip(np.rint(1.5 + 3 * attendance + rng.normal(0, 0.9, n)), 1, 5)
+
+    days, weights = day_weights()
+    providers = [f'Provider_{i}' for i in range(1, n_providers + 1)]
+
+    return pd.DataFrame({
+        'Patient_ID': np.char.add('P-', (numbers + 1000).astype(str)),
+        'Patient_Name': np.char.add('Patient_', numbers.astype(str)),
+        'Age': rng.integers(18, 75, n).astype(np.uint8),
+        'Gender': categorical(rng.integers(0, len(GENDERS), n), GENDERS),
+        'City': categorical(rng.choice(len(CITIES), n, p=CITY_WEIGHTS), CITIES),
+        'Registration_Date': days[rng.choice(len(days), n, p=weights)].astype('datetime64[ns]'),
+        'Program_Type': categorical(program, PROGRAMS),
+        'Therapy_Type': categorical(therapy, THERAPIES),
+        'Total_Sessions_Assigned': total.astype(np.uint16),
+        'Sessions_Attended': attended.astype(np.uint16),
+        'Attendance_Rate': np.round(attendance, 4),
+        'Provider_Name': categorical(rng.choice(n_providers, n, p=provider_weights(n_providers, seed)), providers),
+        'Case_Status': categorical(status, CASE_STATUSES),
+        'Risk_Level': categorical(risk, RISK_LEVELS),
+        'Satisfaction_Score': satisfaction.astype(np.uint8),
+        'Attendance_Rate_Fixed': attendance,
+    }, columns=OUTPUT_COLUMNS)
+
+
+# ----------------------------
+# OUTPUT
+# ----------------------------
+def write_part(chunk_index, output_dir, fmt, chunk_rows, total_rows, seed, n_providers):
+    """Generate one chunk and write it as its own part file; runs in a worker process"""
+    df = generate_chunk(chunk_index, chunk_rows, total_rows, seed, n_providers)
+    part_path = Path(output_dir) / f'part-{chunk_index:05d}.{fmt}'
+    if fmt == 'parquet':
+        pq.write_table(to_arrow(df), part_path)
+    else:
+        df.to_csv(part_path, index=False)
+    return len(df)
+
+
+def run_partitioned(total_rows, output_dir, fmt='parquet', chunk_rows=DEFAULT_CHUNK_ROWS,
+                    seed=42, n_providers=DEFAULT_PROVIDERS, workers=None):
+    """One part file per chunk, generated in parallel across `workers` processes"""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for stale in output_dir.glob('part-*.*'):
+        stale.unlink()  # a previous run may have had more chunks
+    n_chunks = -(-total_rows // chunk_rows)
+    print(f"=== GENERATING {total_rows:,} ROWS IN {n_chunks} {fmt.upper()} PARTS ===")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        rows = pool.map(write_part, range(n_chunks), repeat(output_dir), repeat(fmt), repeat(chunk_rows),
+                        repeat(total_rows), repeat(seed), repeat(n_providers))
+        for i, n in enumerate(rows):
+            print(f"  part {i + 1}/{n_chunks}: {n:,} rows")
+    print(f"\n✅ SYNTHETIC DATA SAVED: {output_dir}")
+
+
+def run_single_file(total_rows, output_path, chunk_rows=DEFAULT_CHUNK_ROWS, seed=42, n_providers=DEFAULT_PROVIDERS):
+    """One cleaned CSV (plus Parquet, Arrow, profile and KPI cube), appended chunk by chunk"""
+    n_chunks = -(-total_rows // chunk_rows)
+    print(f"=== GENERATING {total_rows:,} ROWS IN {n_chunks} CHUNKS ===")
+
+    def chunks():
+        for i in range(n_chunks):
+            df = generate_chunk(i, chunk_rows, total_rows, seed, n_providers)
+            print(f"  chunk {i + 1}/{n_chunks}: {len(df):,} rows")
+            yield df
+
+    profile, cube = write_clean_chunks(chunks(), output_path)
+    print(f"\n✅ SYNTHETIC DATA SAVED: {output_path}")
+    print(f"✅ DATA PROFILE SAVED: {write_profile(profile, output_path, total_rows, sources=[f'synthetic (seed={seed})'])}")
+    if cube is not None:
+        print(f"✅ KPI CUBE SAVED: {write_cube(cube, output_path)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic patients in the cleaned schema")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="rows to generate (default 1M)")
+    parser.add_argument('--output', default=str(OUTPUT_DIR / 'patients'),
+                        help="directory of part files, or a .csv for one dashboard-ready file")
+    parser.add_argument('--format', choices=['parquet', 'csv'], default='parquet',
+                        help="part file format in directory mode (default parquet)")
+    parser.add_argument('--chunk-rows', type=int, default=DEFAULT_CHUNK_ROWS,
+                        help=f"rows per chunk / part file (default {DEFAULT_CHUNK_ROWS:,})")
+    parser.add_argument('--providers', type=int, default=DEFAULT_PROVIDERS)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=None,
+                        help="processes writing part files (default: all CPU cores)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if Path(args.output).suffix.lower() == '.csv':
+        run_single_file(args.rows, args.output, args.chunk_rows, args.seed, args.providers)
+    else:
+        if args.format == 'parquet' and pa is None:
+            parser.error("pyarrow is required for Parquet parts; use --format csv")
+        run_partitioned(args.rows, args.output, args.format, args.chunk_rows, args.seed, args.providers, args.workers)
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
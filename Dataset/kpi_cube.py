@@ -0,0 +1,106 @@
+import pandas as pd
+from pathlib import Path
+
+# ----------------------------
+# CUBE LAYOUT
+# ----------------------------
+# One row per combination of these dimensions that occurs in the data, so the
+# cube's size is bounded by their cardinalities, not by the patient count
+CUBE_DIMENSIONS = [
+    'Program_Type', 'Therapy_Type', 'Case_Status', 'Risk_Level',
+    'Gender', 'City', 'Registration_Month'
+]
+
+# Additive measures only (counts and sums), so cubes built per chunk/file
+# merge by summing and any average is sum / count at read time
+SUM_MEASURES = ['Age', 'Total_Sessions_Assigned', 'Sessions_Attended', 'Satisfaction_Score', 'Attendance_Rate_Fixed']
+
+
+def cube_path_for(output_path):
+    """KPI cube file written next to the cleaned CSV"""
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.stem + '_cube.parquet')
+
+
+# ----------------------------
+# BUILD
+# ----------------------------
+def build_cube(df_clean):
+    """Aggregate cleaned rows into counts and sums per dimension combination"""
+    df = df_clean.assign(
+        Registration_Month=pd.to_datetime(df_clean['Registration_Date']).dt.to_period('M').dt.to_timestamp()
+    )
+    measures = [col for col in SUM_MEASURES if col in df.columns]
+    aggregations = {'Patients': ('Patient_ID', 'size')}
+    for col in measures:
+        aggregations[f'{col}_Sum'] = (col, 'sum')
+        aggregations[f'{col}_Count'] = (col, 'count')
+    cube = df.groupby(CUBE_DIMENSIONS, observed=True, dropna=False).agg(**aggregations)
+    return cube.reset_index()
+
+
+def merge_cubes(cubes):
+    """Combine cubes built from separate chunks/files into one"""
+    cubes = [cube for cube in cubes if cube is not None and len(cube)]
+    if not cubes:
+        return None
+    if len(cubes) == 1:
+        return cubes[0]
+    combined = pd.concat(cubes, ignore_index=True)
+    for col in CUBE_DIMENSIONS[:-1]:
+        combined[col] = combined[col].astype(object)
+    return combined.groupby(CUBE_DIMENSIONS, observed=True, dropna=False).sum().reset_index()
+
+
+def write_cube(cube, output_path):
+    """Persist the cube with categorical dimensions (Parquet; CSV without pyarrow)"""
+    cube = cube.copy()
+    for col in CUBE_DIMENSIONS[:-1]:
+        cube[col] = cube[col].astype('category')
+    cube_path = cube_path_for(output_path)
+    try:
+        cube.to_parquet(cube_path, index=False)
+    except ImportError:
+        cube_path = cube_path.with_suffix('.csv')
+        cube.to_csv(cube_path, index=False)
+    return cube_path
+
+
+# ----------------------------
+# READ (dashboard side)
+# ----------------------------
+def load_cube(output_path):
+    """Load a cube written by write_cube; None if there isn't one"""
+    cube_path = cube_path_for(output_path)
+    if cube_path.exists():
+        try:
+            return pd.read_parquet(cube_path)
+        except ImportError:
+            pass
+    if cube_path.with_suffix('.csv').exists():
+        cube = pd.read_csv(cube_path.with_suffix('.csv'), parse_dates=['Registration_Month'])
+        for col in CUBE_DIMENSIONS[:-1]:
+            cube[col] = cube[col].astype('category')
+        return cube
+    return None
+
+
+def filter_cube(cube, filters):
+    """Cube rows matching {column: [values]} filters; None if a filter isn't a cube dimension"""
+    if any(col not in CUBE_DIMENSIONS for col in filters):
+        return None
+    mask = pd.Series(True, index=cube.index)
+    for col, values in filters.items():
+        mask &= cube[col].isin(values)
+    return cube[mask]
+
+
+def cube_counts(cube, by, measure='Patients'):
+    """Sum of `measure` per `by` (a dimension name or list), largest first"""
+    return cube.groupby(by, observed=True)[measure].sum().sort_values(ascending=False)
+
+
+def cube_mean(cube, by, column):
+    """Mean of a summed column per `by`, from its _Sum and _Count measures"""
+    grouped = cube.groupby(by, observed=True)[[f'{column}_Sum', f'{column}_Count']].sum()
+    return (grouped[f'{column}_Sum'] / grouped[f'{column}_Count']).dropna()
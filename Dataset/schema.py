@@ -0,0 +1,141 @@
+import argparse
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+try:
+    import pyarrow as pa
+except ImportError:  # the memory-mapped Arrow copy needs pyarrow; CSV/Parquet readers don't
+    pa = None
+
+# What reading a typed copy (Parquet/Arrow) raises when pyarrow is missing or
+# the file is truncated or corrupt; readers fall back to the CSV on these
+COPY_READ_ERRORS = (ImportError, OSError) if pa is None else (ImportError, OSError, pa.ArrowException)
+
+# ----------------------------
+# COMPACT DTYPES FOR THE CLEANED DATASET
+# ----------------------------
+# Shared by data_cleaning.py (typed Parquet and Arrow output) and the
+# dashboard (CSV fallback), so both hold the cleaned data in the same
+# compact types
+
+# Small non-negative counts; a column that doesn't fit (or has nulls) falls
+# back to the smallest type that holds it
+INTEGER_COLUMNS = {
+    'Age': 'uint8',
+    'Total_Sessions_Assigned': 'uint16',
+    'Sessions_Attended': 'uint16',
+    'Satisfaction_Score': 'uint8',
+}
+
+# Rates in [0, 1]; float32 keeps ~7 significant digits, plenty for percentages
+FLOAT_COLUMNS = ['Attendance_Rate', 'Attendance_Rate_Fixed']
+
+# Low-cardinality text columns
+CATEGORICAL_COLUMNS = [
+    'Gender', 'City', 'Program_Type', 'Therapy_Type',
+    'Provider_Name', 'Case_Status', 'Risk_Level'
+]
+
+DATE_COLUMNS = ['Registration_Date']
+
+# One value per patient, so nothing to gain from categoricals
+STRING_COLUMNS = ['Patient_ID', 'Patient_Name']
+
+
+def compact_integer(series, dtype):
+    """Cast to `dtype` when the values fit; otherwise downcast as far as they allow"""
+    values = pd.to_numeric(series, errors='coerce')
+    if values.isna().any():
+        return values.astype('float32')
+    info = np.iinfo(dtype)
+    if len(values) == 0 or (values.min() >= info.min and values.max() <= info.max and (values % 1 == 0).all()):
+        return values.astype(dtype)
+    return pd.to_numeric(values, downcast='integer')
+
+
+def apply_schema(df):
+    """Return `df` with the compact dtypes above (columns not listed are left as is)"""
+    df = df.copy()
+    for col, dtype in INTEGER_COLUMNS.items():
+        if col in df.columns:
+            df[col] = compact_integer(df[col], dtype)
+    for col in FLOAT_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    return df
+
+
+def read_clean_csv(path):
+    """Read the cleaned CSV straight into the compact dtypes"""
+    header = pd.read_csv(path, nrows=0).columns
+    dtype = {col: 'category' for col in CATEGORICAL_COLUMNS if col in header}
+    dtype.update({col: 'float32' for col in FLOAT_COLUMNS if col in header})
+    parse_dates = [col for col in DATE_COLUMNS if col in header]
+    return apply_schema(pd.read_csv(path, dtype=dtype, parse_dates=parse_dates))
+
+
+def _mapped_series(column):
+    """A column of a memory-mapped table as a Series, without copying where the layout allows"""
+    if column.num_chunks == 1 and column.null_count == 0 and (
+            pa.types.is_integer(column.type) or pa.types.is_floating(column.type) or pa.types.is_timestamp(column.type)):
+        # A read-only numpy view of the mapped pages
+        return pd.Series(column.chunk(0).to_numpy(zero_copy_only=True), copy=False)
+    # Text becomes Arrow-backed strings over the mapped buffers (pandas >= 3);
+    # categoricals get their codes narrowed to pandas' width (a copy of 1-2
+    # bytes per row), numbers with nulls or in several batches are copied
+    return column.to_pandas()
+
+
+def read_clean_arrow(path):
+    """Memory-map the cleaned Arrow IPC file written by data_cleaning.py as a DataFrame.
+
+    The file is already in the compact dtypes, so nothing is converted: the
+    columns point into the mapping, and every process that maps the file
+    shares the same physical pages through the OS page cache. Treat the
+    frame as read-only (its numeric arrays are read-only views).
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required to map the Arrow copy")
+    table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    return pd.DataFrame({name: _mapped_series(column) for name, column in zip(table.column_names, table.columns)},
+                        copy=False)
+
+
+# ----------------------------
+# MEMORY REPORT
+# ----------------------------
+def memory_report(before, after):
+    """Per-column in-memory size (deep) of two versions of the same frame"""
+    report = pd.DataFrame({
+        'dtype_before': before.dtypes.astype(str),
+        'dtype_after': after.dtypes.astype(str),
+        'mb_before': before.memory_usage(deep=True, index=False) / 2**20,
+        'mb_after': after.memory_usage(deep=True, index=False) / 2**20,
+    })
+    report.loc['TOTAL'] = ['', '', report['mb_before'].sum(), report['mb_after'].sum()]
+    report['reduction'] = report['mb_before'] / report['mb_after']
+    return report
+
+
+def print_memory_report(before, after, label='default dtypes'):
+    report = memory_report(before, after)
+    print(f"\n=== MEMORY BY COLUMN ({label} -> compact schema) ===")
+    print(report.to_string(float_format=lambda x: f"{x:,.3f}"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report memory of the cleaned data with default vs compact dtypes")
+    parser.add_argument('path', nargs='?', default=str(Path(__file__).parent / 'CleanedData' / 'patients_master_clean.csv'))
+    args = parser.parse_args()
+    print_memory_report(pd.read_csv(args.path), read_clean_csv(args.path))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+from kpi_cube import cube_counts, cube_mean
+
+AGE_BINS = [0, 30, 50, 70, 100]
+AGE_LABELS = ['18-30', '31-50', '51-70', '70+']
+
+# Grouped together in one pass over the filtered rows; every chart of the
+# mental-health layout is a marginal (or pair) of this table
+GROUP_DIMENSIONS = [
+    'Program_Type', 'Therapy_Type', 'Case_Status', 'Risk_Level',
+    'Gender', 'City', 'Provider_Name', 'Age_Group', 'Registration_Month'
+]
+
+# Columns whose per-group mean is charted (kept as _Sum/_Count, as in the KPI cube)
+MEAN_MEASURES = ['Sessions_Attended']
+
+PROGRAMS = ['Psychiatric Care', 'Substance Use Treatment']
+
+# Source column each derived dimension is computed from
+_SOURCE_COLUMNS = {'Age_Group': 'Age', 'Registration_Month': 'Registration_Date'}
+
+
+# ----------------------------
+# GROUPED PASS
+# ----------------------------
+def _dimension_codes(df, col):
+    """(codes, categories) of a dimension; missing values get code -1"""
+    if col == 'Age_Group':
+        groups = pd.cut(df['Age'], bins=AGE_BINS, labels=AGE_LABELS)
+        return groups.cat.codes.to_numpy(), groups.cat.categories
+    if col == 'Registration_Month':
+        months = pd.to_datetime(df['Registration_Date']).to_numpy().astype('datetime64[M]')
+        codes, uniques = pd.factorize(months)
+        return codes, pd.DatetimeIndex(uniques.astype('datetime64[ns]'))
+    if isinstance(df[col].dtype, pd.CategoricalDtype):
+        return df[col].cat.codes.to_numpy(), df[col].cat.categories
+    return pd.factorize(df[col])
+
+
+def group_rows(df, dimensions):
+    """Patients and measure sums/counts per combination of `dimensions` that occurs in `df`.
+
+    The dimensions' codes are folded into one int64 key per row and grouped
+    with a single np.unique, so the rows are scanned once however many
+    aggregates are derived from the result. The table has the KPI cube's
+    layout (dimensions, Patients, <col>_Sum, <col>_Count).
+    """
+    dimensions = [col for col in dimensions if _SOURCE_COLUMNS.get(col, col) in df.columns]
+    key = np.zeros(len(df), dtype=np.int64)
+    n_keys = 1
+    codes = {}
+    categories = {}
+    for col in dimensions:
+        codes[col], categories[col] = _dimension_codes(df, col)
+        size = len(categories[col]) + 1  # +1 for missing values
+        if n_keys * size >= 2**63:
+            # Re-number the combinations seen so far before the key overflows
+            key, uniques = pd.factorize(key)
+            n_keys = len(uniques)
+        key = key * size + (codes[col] + 1)
+        n_keys *= size
+
+    _, first, inverse = np.unique(key, return_index=True, return_inverse=True)
+    table = {}
+    for col in dimensions:
+        group_codes = codes[col][first]
+        if col == 'Registration_Month':
+            table[col] = categories[col].take(group_codes, allow_fill=True, fill_value=pd.NaT)
+        else:
+            table[col] = pd.Categorical.from_codes(group_codes, categories[col])
+    table['Patients'] = np.bincount(inverse, minlength=len(first))
+    for col in MEAN_MEASURES:
+        if col in df.columns:
+            values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+            valid = ~np.isnan(values)
+            table[f'{col}_Sum'] = np.bincount(inverse, weights=np.where(valid, values, 0), minlength=len(first))
+            table[f'{col}_Count'] = np.bincount(inverse, weights=valid, minlength=len(first))
+    return pd.DataFrame(table)
+
+
+# ----------------------------
+# DERIVED AGGREGATES
+# ----------------------------
+def _program_kpis(table, program):
+    """Patients, high-risk, completed and average sessions for one Program_Type"""
+    rows = table[table['Program_Type'] == program]
+    kpis = {'patients': int(rows['Patients'].sum()), 'high_risk': None, 'completed': None, 'avg_sessions': None}
+    if 'Risk_Level' in rows.columns:
+        kpis['high_risk'] = int(rows.loc[rows['Risk_Level'] == 'High', 'Patients'].sum())
+    if 'Case_Status' in rows.columns:
+        kpis['completed'] = int(rows.loc[rows['Case_Status'] == 'Completed', 'Patients'].sum())
+    if 'Sessions_Attended_Count' in rows.columns:
+        sessions = rows['Sessions_Attended_Count'].sum()
+        kpis['avg_sessions'] = rows['Sessions_Attended_Sum'].sum() / sessions if sessions else float('nan')
+    return kpis
+
+
+def compute_aggregates(df, cube_view=None):
+    """Every aggregate the mental-health layout charts, keyed by name.
+
+    With a filtered KPI cube, the dimensions it holds are read from it and
+    only the rest (Provider_Name, Age_Group) are grouped from `df`; otherwise
+    all of them come from one grouped pass over `df`. An aggregate is left out
+    when its columns are missing from the data.
+    """
+    if cube_view is not None:
+        tables = [cube_view, group_rows(df, [col for col in GROUP_DIMENSIONS if col not in cube_view.columns])]
+    else:
+        tables = [group_rows(df, GROUP_DIMENSIONS)]
+
+    def table_with(*columns):
+        return next((table for table in tables if all(col in table.columns for col in columns)), None)
+
+    aggregates = {}
+    if (table := table_with('Gender')) is not None:
+        aggregates['gender_counts'] = cube_counts(table, 'Gender').reset_index().set_axis(['Gender', 'Count'], axis=1)
+    if (table := table_with('Age_Group')) is not None:
+        age_groups = table.groupby('Age_Group', observed=False)['Patients'].sum()
+        aggregates['age_groups'] = age_groups.reset_index().set_axis(['Age Group', 'Count'], axis=1)
+    if (table := table_with('City')) is not None:
+        aggregates['top10_cities'] = cube_counts(table, 'City').head(10).reset_index().set_axis(['City', 'Patients'], axis=1)
+    if (table := table_with('Registration_Month')) is not None:
+        months = table['Registration_Month'].dt.strftime('%Y-%m').rename('Month')
+        aggregates['registration_trend'] = table.groupby(months)['Patients'].sum().reset_index()
+    if (table := table_with('Therapy_Type', 'Case_Status')) is not None:
+        therapy_status = table.groupby(['Therapy_Type', 'Case_Status'], observed=True)['Patients'].sum()
+        aggregates['therapy_status_counts'] = therapy_status.reset_index(name='Count')
+    if (table := table_with('Therapy_Type', 'Sessions_Attended_Sum')) is not None:
+        avg_sessions = cube_mean(table, 'Therapy_Type', 'Sessions_Attended').rename('Sessions_Attended')
+        aggregates['avg_sessions_by_therapy'] = avg_sessions.sort_values(ascending=False).head(8).reset_index()
+    if (table := table_with('Program_Type')) is not None:
+        aggregates['program_kpis'] = {program: _program_kpis(table, program) for program in PROGRAMS}
+    if (table := table_with('Provider_Name')) is not None:
+        aggregates['provider_counts'] = cube_counts(table, 'Provider_Name').head(15).reset_index().set_axis(['Provider', 'Patient_Count'], axis=1)
+    if (table := table_with('Registration_Month', 'Program_Type')) is not None:
+        by_month = [table['Registration_Month'].dt.month.rename('Month'), 'Program_Type']
+        aggregates['monthly_program_counts'] = table.groupby(by_month, observed=True)['Patients'].sum().reset_index(name='Count')
+    return aggregates
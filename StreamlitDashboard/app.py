@@ -1,11 +1,33 @@
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
-import io
+from functools import partial
+import json
+import os
+import sys
 from pathlib import Path
 
+# Shared data modules (cleaner, schema, KPI cube) live next to the dataset
+sys.path.insert(0, str(Path(__file__).parent.parent / 'Dataset'))
+import kpi_cube
+import schema
+from aggregations import compute_aggregates
+from chart_stats import SCATTER_WEBGL_THRESHOLD, box_stats, histogram_bins, kde_grid, ols_by_group, stratified_sample
+from column_profile import column_summary
+from exporters import EXPORT_FORMATS, available_formats, export_bytes
+from filter_engine import BitmapFilterIndex
+from rerun_profiler import RerunProfiler, profiling_enabled
+from results_cache import ResultsCache, filter_state_key
+from type_inference import SAMPLE_ROWS, infer_column, read_csv_inferred
+
+# Cleaned dataset behind "Use Default Dataset". DASHBOARD_DATA_PATH points it
+# at another cleaned CSV (benchmarks, load tests); its Parquet copy, profile
+# and KPI cube are looked up next to it
+DEFAULT_DATA_PATH = Path(os.environ.get('DASHBOARD_DATA_PATH') or Path(__file__).parent.parent / 'Dataset' / 'CleanedData' / 'patients_master_clean.csv')
+
 # ========== PAGE CONFIG ==========
 st.set_page_config(
     page_title="Analytics Dashboard",
@@ -14,6 +36,11 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Section timings for this rerun (?profile=1 or DASHBOARD_PROFILE=1); a
+# no-op otherwise
+profiler = RerunProfiler(enabled=profiling_enabled(st.query_params))
+profiler.start("page setup")
+
 # ========== CUSTOM CSS - PROFESSIONAL CORPORATE DESIGN ==========
 st.markdown("""
 <style>
@@ -491,21 +518,56 @@ st.markdown("""
 
 # ========== HELPER FUNCTIONS ==========
 def detect_column_types(df):
-    """Detect numeric, categorical, and date columns"""
-    numeric_cols = df.select_dtypes(include=['int64', 'float64', 'int32', 'float32']).columns.tolist()
-    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
-    date_cols = df.select_dtypes(include=['datetime64']).columns.tolist()
-    
-    for col in categorical_cols.copy():
-        try:
-            pd.to_datetime(df[col], errors='raise')
-            df[col] = pd.to_datetime(df[col])
+    """Detect numeric, categorical, and date columns (without modifying df).
+
+    Text columns whose sampled values all parse with one date format are
+    reported as dates, with that format, in `date_formats`.
+    """
+    numeric_cols, categorical_cols, date_cols, date_formats = [], [], [], {}
+    for col in df.columns:
+        dtype = df[col].dtype
+        if pd.api.types.is_bool_dtype(dtype):
+            continue
+        if pd.api.types.is_numeric_dtype(dtype):
+            numeric_cols.append(col)
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
             date_cols.append(col)
-            categorical_cols.remove(col)
-        except:
-            pass
-   
-    return numeric_cols, categorical_cols, date_cols
+        elif isinstance(dtype, pd.CategoricalDtype):
+            categorical_cols.append(col)
+        elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            sample = df[col].dropna().head(SAMPLE_ROWS).astype(str)
+            spec = infer_column(sample)
+            if spec['kind'] == 'date':
+                date_cols.append(col)
+                date_formats[col] = spec['format']
+            else:
+                categorical_cols.append(col)
+    return numeric_cols, categorical_cols, date_cols, date_formats
+
+def dataset_fingerprint(source_id, df):
+    """Identify a loaded dataset by its source, shape, schema and first rows"""
+    head_hash = int(pd.util.hash_pandas_object(df.head(1000), index=False).sum())
+    return (source_id, len(df), tuple(df.columns), tuple(df.dtypes.astype(str)), head_hash)
+
+@st.cache_resource(max_entries=4)
+def get_typed_dataset(fingerprint, _df):
+    """Column types detected once per dataset, plus a typed view of it.
+
+    Date-like text columns are parsed in the view (a new frame); the frame
+    from the loaders, which may be a cached object, is left untouched. The
+    view is shared across reruns and sessions, so treat it as read-only.
+    """
+    numeric_cols, categorical_cols, date_cols, date_formats = detect_column_types(_df)
+    parsed = {}
+    for col, fmt in date_formats.items():
+        try:
+            parsed[col] = pd.to_datetime(_df[col], format=fmt)
+        except ValueError:
+            # Values past the sample don't match; keep the column as text
+            date_cols.remove(col)
+            categorical_cols.append(col)
+    typed = _df.assign(**parsed) if parsed else _df
+    return typed, numeric_cols, categorical_cols, date_cols
    
 def is_mental_health_data(df):
     """Check if dataframe contains mental health specific columns"""
@@ -516,18 +578,45 @@ def is_mental_health_data(df):
             return True
     return False
     
-@st.cache_data
-def load_default_data():
-    """Load data from the existing project structure"""
+def data_version(csv_path):
+    """Modification times of the cleaned CSV and its Parquet and Arrow copies (None if missing)"""
+    return tuple(path.stat().st_mtime if path.exists() else None
+                 for path in (csv_path, csv_path.with_suffix('.parquet'), csv_path.with_suffix('.arrow')))
+
+@st.cache_resource(max_entries=1)
+def load_default_data(csv_path, version):
+    """Load the cleaned dataset once per server process.
+
+    Every session and rerun gets the same frame (st.cache_data would hand
+    each one its own unpickled copy), so treat it as read-only. A new
+    `version` (the files were rewritten) replaces it.
+    """
     try:
-        csv_path = Path(__file__).parent.parent / 'Dataset' / 'CleanedData' / 'patients_master_clean.csv'
+        def is_current(path):
+            return path.exists() and (not csv_path.exists() or path.stat().st_mtime >= csv_path.stat().st_mtime)
+
+        # Prefer the Arrow copy written by data_cleaning.py: it is memory-mapped
+        # rather than read, so startup is near-instant and every server process
+        # shares the same pages through the OS page cache. Next best is the
+        # typed Parquet copy: it is already in the compact schema (small ints,
+        # float32 rates, categoricals, dates), so no text parsing or coercion
+        # is needed. Fall back to the CSV, read into the same schema, if both
+        # are missing, stale or unreadable.
+        arrow_path = csv_path.with_suffix('.arrow')
+        if is_current(arrow_path):
+            try:
+                return schema.read_clean_arrow(arrow_path), None
+            except schema.COPY_READ_ERRORS:
+                pass
+        parquet_path = csv_path.with_suffix('.parquet')
+        if is_current(parquet_path):
+            try:
+                return schema.apply_schema(pd.read_parquet(parquet_path)), None
+            except schema.COPY_READ_ERRORS:
+                pass
         if not csv_path.exists():
             return None, "File not found"
-        df = pd.read_csv(csv_path)
-        if 'Registration_Date' in df.columns:
-            df['Registration_Date'] = pd.to_datetime(df['Registration_Date'], errors='coerce')
-        if 'Attendance_Rate' in df.columns:
-            df['Attendance_Rate'] = pd.to_numeric(df['Attendance_Rate'], errors='coerce')
+        df = schema.read_clean_csv(csv_path)
         if 'Attendance_Rate_Fixed' not in df.columns:
             if 'Sessions_Attended' in df.columns and 'Total_Sessions_Assigned' in df.columns:
                 df['Attendance_Rate_Fixed'] = df['Sessions_Attended'] / df['Total_Sessions_Assigned']
@@ -535,27 +624,106 @@ def load_default_data():
     except Exception as e:
         return None, str(e)
 
+@st.cache_data
+def load_data_profile(csv_path, version):
+    """Load the per-column data-quality profile written by data_cleaning.py; `version` reloads it after a re-clean"""
+    profile_path = csv_path.with_name(csv_path.stem + '_profile.json')
+    if not profile_path.exists():
+        return None
+    with open(profile_path) as f:
+        return json.load(f)
+
+@st.cache_resource(max_entries=1)
+def load_kpi_cube(csv_path, version):
+    """Load the pre-aggregated KPI cube written by data_cleaning.py (None if missing or stale); shared and read-only"""
+    cube_path = kpi_cube.cube_path_for(csv_path)
+    if not cube_path.exists():
+        cube_path = cube_path.with_suffix('.csv')
+    if not cube_path.exists() or (csv_path.exists() and cube_path.stat().st_mtime < csv_path.stat().st_mtime):
+        return None
+    return kpi_cube.load_cube(csv_path)
+
+@st.cache_resource(max_entries=4)
+def get_filter_index(dataset_key, _df, columns):
+    """Bitmap index over the sidebar filter columns, built once per dataset"""
+    return BitmapFilterIndex(_df, columns)
+
+@st.cache_resource
+def get_results_cache():
+    """Process-wide LRU of filtered row positions and aggregates per filter state"""
+    return ResultsCache()
+
+def cached_result(name, compute):
+    """Memoize a result derived from the current filter state (`state_key`)"""
+    return get_results_cache().get_or_compute(state_key, name, compute)
+
+def histogram_figure(bins, column, title):
+    """Bar chart of precomputed histogram bins (chart_stats.histogram_bins)"""
+    return go.Figure(
+        go.Bar(
+            x=(bins['start'] + bins['end']) / 2,
+            y=bins['count'],
+            width=bins['end'] - bins['start'],
+            customdata=bins[['start', 'end']],
+            marker_color='#3b82f6',
+            hovertemplate=f"{column}=%{{customdata[0]:.4g}} – %{{customdata[1]:.4g}}<br>count=%{{y}}<extra></extra>"
+        ),
+        layout=dict(title=title, xaxis_title=column, yaxis_title='count', bargap=0)
+    )
+
+def box_trace(stats, position, name, **kwargs):
+    """Box from precomputed quartiles and whiskers (chart_stats.box_stats)"""
+    return go.Box(
+        x=[position], q1=[stats['q1']], median=[stats['median']], q3=[stats['q3']],
+        lowerfence=[stats['lowerfence']], upperfence=[stats['upperfence']],
+        mean=[stats['mean']], sd=[stats['sd']], name=name, boxpoints=False, **kwargs
+    )
+
+def box_figure(stats, column, title):
+    """Box plot with its (capped) outliers; empty when the column has no values"""
+    fig = go.Figure()
+    if stats is not None:
+        fig.add_trace(box_trace(stats, column, column, marker_color='#3b82f6'))
+    if stats is not None and len(stats['outliers']):
+        fig.add_trace(go.Scatter(
+            x=[column] * len(stats['outliers']), y=stats['outliers'], mode='markers',
+            marker=dict(color='#3b82f6', size=4), name='outliers',
+            hovertemplate=f"{column}=%{{y}}<extra>outlier</extra>"
+        ))
+    fig.update_layout(title=title, yaxis_title=column, showlegend=False)
+    return fig
+
+def violin_figure(kde, stats, column, title):
+    """Mirrored density curve (chart_stats.kde_grid) with the box drawn inside"""
+    fig = go.Figure()
+    if kde is not None:
+        grid, density = kde
+        half_width = 0.45 * density / density.max()
+        fig.add_trace(go.Scatter(
+            x=np.concatenate([half_width, -half_width[::-1]]),
+            y=np.concatenate([grid, grid[::-1]]),
+            fill='toself', mode='lines', line=dict(color='#3b82f6', width=1),
+            customdata=np.concatenate([density, density[::-1]]), name=column,
+            hovertemplate=f"{column}=%{{y:.4g}}<br>density=%{{customdata:.4g}}<extra></extra>"
+        ))
+    if stats is not None:
+        fig.add_trace(box_trace(stats, 0, column, width=0.08, marker_color='#1e293b', fillcolor='#ffffff'))
+    fig.update_layout(title=title, yaxis_title=column, showlegend=False,
+                      xaxis=dict(showticklabels=False, range=[-0.5, 0.5]))
+    return fig
+
 def load_uploaded_data(uploaded_file):
     """Load and process uploaded CSV file"""
     try:
-        df = pd.read_csv(uploaded_file)
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                try:
-                    df[col] = pd.to_datetime(df[col], errors='ignore')
-                except:
-                    pass
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                try:
-                    df[col] = pd.to_numeric(df[col], errors='ignore')
-                except:
-                    pass
+        # Column types (numeric, date + format, categorical, text) are inferred
+        # from a row sample, then the file is parsed once with them
+        df, _ = read_csv_inferred(uploaded_file)
         return df, None
     except Exception as e:
         return None, str(e)
 
 # ========== SIDEBAR ==========
+profiler.start("sidebar")
 with st.sidebar:
     st.markdown('<div class="sidebar-logo">', unsafe_allow_html=True)
     st.image("https://img.icons8.com/fluency/96/hospital.png", width=64)
@@ -582,7 +750,8 @@ with st.sidebar:
         st.markdown("### 📤 File Upload")
         uploaded_file = st.file_uploader("", type=['csv'], label_visibility="collapsed")
         if uploaded_file is not None:
-            df, error_msg = load_uploaded_data(uploaded_file)
+            with profiler.section("load_uploaded_data"):
+                df, error_msg = load_uploaded_data(uploaded_file)
             if df is not None:
                 st.success(f"✓ {uploaded_file.name}")
                 st.info(f"📊 {len(df):,} rows × {len(df.columns)} cols")
@@ -593,10 +762,12 @@ with st.sidebar:
             st.info("Please upload a CSV file")
             st.stop()
     else:
-        df, error_msg = load_default_data()
+        with profiler.section("load_default_data"):
+            default_version = data_version(DEFAULT_DATA_PATH)
+            df, error_msg = load_default_data(DEFAULT_DATA_PATH, default_version)
         if df is not None:
             st.success("✓ Default dataset loaded")
-            is_mental_health = True
+            is_mental_health = is_mental_health_data(df)
         else:
             st.error(f"Could not load default dataset")
             st.stop()
@@ -604,30 +775,64 @@ with st.sidebar:
     if df is None:
         st.stop()
     
+    # Everything cached per dataset (types, filter index, results) is keyed
+    # by this fingerprint; the default dataset's includes its file version,
+    # since a re-clean can change rows without changing the shape or head
+    with profiler.section("detect_column_types"):
+        if data_source == "Upload New CSV File":
+            dataset_key = dataset_fingerprint(uploaded_file.file_id, df)
+        else:
+            dataset_key = dataset_fingerprint((str(DEFAULT_DATA_PATH), default_version), df)
+        df, numeric_cols, categorical_cols, date_cols = get_typed_dataset(dataset_key, df)
     total_records = len(df)
-    numeric_cols, categorical_cols, date_cols = detect_column_types(df)
     
     st.markdown("---")
     st.markdown("### 🔍 Filters")
     
     selected_filters = {}
-    if len(categorical_cols) > 0:
-        for col in categorical_cols[:4]:
-            unique_values = df[col].dropna().unique()
-            if len(unique_values) <= 100:
-                default_selection = list(unique_values)[:10] if len(unique_values) > 10 else list(unique_values)
-                selected = st.multiselect(col, options=sorted(unique_values, key=str), default=default_selection, key=f"filter_{col}")
-                if len(selected) > 0:
-                    selected_filters[col] = selected
-    
-    df_filtered = df.copy()
-    for col, values in selected_filters.items():
-        df_filtered = df_filtered[df_filtered[col].isin(values)]
+    filter_cols = []
+    with profiler.section("filter widgets"):
+        if len(categorical_cols) > 0:
+            for col in categorical_cols[:4]:
+                unique_values = df[col].dropna().unique()
+                if len(unique_values) <= 100:
+                    filter_cols.append(col)
+                    default_selection = list(unique_values)[:10] if len(unique_values) > 10 else list(unique_values)
+                    selected = st.multiselect(col, options=sorted(unique_values, key=str), default=default_selection, key=f"filter_{col}")
+                    if len(selected) > 0:
+                        selected_filters[col] = selected
+    
+    # Filter through the cached bitmap index: one OR/AND pass over packed
+    # bits and a single take, instead of copying and rescanning the frame
+    with profiler.section("apply filters"):
+        filter_index = get_filter_index(dataset_key, df, tuple(filter_cols))
+        # Row positions and every aggregate below are memoized per filter state,
+        # so flipping back to a recent view skips the filtering and grouping
+        state_key = filter_state_key(dataset_key, selected_filters)
+        positions = cached_result('positions', lambda: filter_index.positions(selected_filters))
+        # The session only holds its filter selection: unfiltered it reads the
+        # shared frame itself, filtered it reads the subset shared by every
+        # session on the same filter state
+        df_filtered = df if positions is None else cached_result('rows', lambda: df.take(positions))
+
+    # Charts over the cube's dimensions are answered from the KPI cube instead
+    # of re-grouping patient rows; cube_view is None when it can't answer
+    # (uploaded data, a filter on a non-cube column, or a cube that doesn't
+    # match the loaded rows) and the charts fall back to df_filtered
+    cube_view = None
+    if data_source == "Use Default Dataset":
+        with profiler.section("load_kpi_cube"):
+            cube = load_kpi_cube(DEFAULT_DATA_PATH, data_version(DEFAULT_DATA_PATH))
+        if cube is not None:
+            cube_view = cached_result('cube_view', lambda: kpi_cube.filter_cube(cube, selected_filters))
+            if cube_view is not None and cube_view['Patients'].sum() != len(df_filtered):
+                cube_view = None
     
     st.markdown("---")
     st.info(f"**{len(df_filtered):,}** of **{total_records:,}** records")
 
 # ========== TOP HEADER ==========
+profiler.start("top header")
 st.markdown(f"""
 <div class="top-header">
     <div>
@@ -646,6 +851,7 @@ st.markdown(f"""
 
 
 # ========== KPI CARDS ==========
+profiler.start("kpi cards")
 cols = st.columns(4)
 
 kpi_data = [
@@ -653,7 +859,7 @@ kpi_data = [
 ]
 
 for idx, col in enumerate(numeric_cols[:3], 0):
-    avg_val = df_filtered[col].mean()
+    avg_val = cached_result(f'mean:{col}', lambda: df_filtered[col].mean())
     if avg_val > 1000:
         value = f"{avg_val:,.0f}"
     else:
@@ -677,34 +883,61 @@ for idx, (icon, label, value, change, color) in enumerate(kpi_data[:4]):
 st.markdown("<br>", unsafe_allow_html=True)
 
 # ========== DATA PREVIEW ==========
-with st.expander("🔍 Data Preview & Analytics", expanded=False):
-    col1, col2 = st.columns([2, 1])
-    with col1:
-        st.markdown("**📊 Dataset Preview**")
-        st.dataframe(df_filtered.head(20), use_container_width=True, height=400)
-    with col2:
-        st.markdown("**📋 Column Summary**")
-        col_info = pd.DataFrame({
-            'Column': df_filtered.columns,
-            'Type': df_filtered.dtypes.astype(str),
-            'Non-Null': df_filtered.count().values,
-            'Unique': [df_filtered[col].nunique() for col in df_filtered.columns]
-        })
-        st.dataframe(col_info, use_container_width=True, height=400)
+profiler.start("data preview")
+# Tracking the open state makes the expander rerun on toggle, so its
+# contents are only computed while it's open
+preview = st.expander("🔍 Data Preview & Analytics", expanded=False, key="data_preview", on_change="rerun")
+if preview.open:
+    with preview:
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            st.markdown("**📊 Dataset Preview**")
+            st.dataframe(df_filtered.head(20), use_container_width=True, height=400)
+        with col2:
+            st.markdown("**📋 Column Summary**")
+            # The cleaner's profile already has non-null/distinct counts for the
+            # full default dataset; only recompute when filters narrow the rows
+            profile = load_data_profile(DEFAULT_DATA_PATH, data_version(DEFAULT_DATA_PATH)) if data_source == "Use Default Dataset" else None
+            if profile is not None and len(df_filtered) == profile['rows_clean'] and all(col in profile['columns'] for col in df_filtered.columns):
+                col_info = pd.DataFrame({
+                    'Column': df_filtered.columns,
+                    'Type': df_filtered.dtypes.astype(str),
+                    'Non-Null': [profile['columns'][col]['non_null'] for col in df_filtered.columns],
+                    'Unique': [profile['columns'][col]['distinct'] for col in df_filtered.columns]
+                })
+                approx_cols = [col for col in df_filtered.columns if profile['columns'][col].get('distinct_approx')]
+            else:
+                col_info, approx_cols = cached_result('column_summary', lambda: column_summary(df_filtered))
+            st.dataframe(col_info, use_container_width=True, height=400)
+            if approx_cols:
+                st.caption(f"≈ Unique is a HyperLogLog estimate (~1% error) for {', '.join(approx_cols)}")
+            if profile is not None:
+                dropped = [f"{rule['rule']}: {rule['rows_dropped']:,}" for rule in profile['rules'] if rule['rows_dropped']]
+                st.caption(f"🧹 Cleaning kept {profile['rows_clean']:,} of {profile['rows_raw']:,} raw rows"
+                           + (f" (dropped by {', '.join(dropped)})" if dropped else ""))
 
 # ========== CONDITIONAL DASHBOARD ==========
+profiler.start("dashboard")
 if is_mental_health and all(col in df_filtered.columns for col in ['Gender', 'Program_Type', 'Therapy_Type']):
-    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["📊 Demographics", "🩺 Therapy", "🏥 Psychiatric", "💊 Substance Use", "👨‍⚕️ Providers", "📅 Appointments"])
-    
-    with tab1:
+    # Every chart below reads from one grouped pass over the filtered rows
+    # (or the KPI cube), computed once per filter state
+    with profiler.section("compute_aggregates"):
+        aggregates = cached_result('aggregates', lambda: compute_aggregates(df_filtered, cube_view))
+    # Only the selected view runs (st.tabs executes every tab body on each
+    # rerun); a view is computed on first visit and then mostly served from
+    # the results cache
+    views = ["📊 Demographics", "🩺 Therapy", "🏥 Psychiatric", "💊 Substance Use", "👨‍⚕️ Providers", "📅 Appointments"]
+    active_view = st.radio("View", views, horizontal=True, label_visibility="collapsed", key="mental_health_view")
+    profiler.start(f"view: {active_view}")
+    
+    if active_view == views[0]:
         st.markdown('<div class="section-card">', unsafe_allow_html=True)
         st.markdown('<div class="section-header"><h2 style="margin:0;">📊 Patient Demographics</h2></div>', unsafe_allow_html=True)
         
         col1, col2 = st.columns(2)
         with col1:
             if 'Gender' in df_filtered.columns:
-                gender_data = df_filtered['Gender'].value_counts().reset_index()
-                gender_data.columns = ['Gender', 'Count']
+                gender_data = aggregates['gender_counts']
                 fig = px.pie(gender_data, names='Gender', values='Count', title="Gender Distribution", hole=0.45, color_discrete_sequence=['#3b82f6', '#8b5cf6', '#10b981'])
                 fig.update_layout(
                     paper_bgcolor='rgba(0,0,0,0)',
@@ -717,15 +950,109 @@ if is_mental_health and all(col in df_filtered.columns for col in ['Gender', 'Pr
                 )
                 st.plotly_chart(fig, use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
+
+        with col2:
+            if 'Age' in df_filtered.columns:
+                age_data = aggregates['age_groups']
+
+                fig = px.bar(
+                    age_data,
+                    x='Age Group',
+                    y='Count',
+                    title="Age Distribution",
+                    color='Count',
+                    color_continuous_scale='Blues'
+                )
+
+                fig.update_layout(
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    font=dict(family="Inter", size=12),
+                    title_font_size=16,
+                    title_font_color='#1e293b',
+                    xaxis=dict(showgrid=False),
+                    yaxis=dict(showgrid=True, gridcolor='#e2e8f0'),
+                    margin=dict(t=40, b=20, l=20, r=20)
+                )
+
+                st.plotly_chart(fig, use_container_width=True)
+
+        col3, col4 = st.columns(2)
+
+        with col3:
+            st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+
+            if 'City' in df_filtered.columns:
+                city_data = aggregates['top10_cities']
+
+                fig = px.bar(
+                    city_data,
+                    x='Patients',
+                    y='City',
+                    orientation='h',
+                    title="Top 10 Cities",
+                    color='Patients',
+                    color_continuous_scale='Viridis'
+                )
+
+                fig.update_layout(
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    font=dict(family="Inter", size=12),
+                    title_font_size=16,
+                    title_font_color='#1e293b',
+                    xaxis=dict(showgrid=True, gridcolor='#e2e8f0'),
+                    yaxis=dict(showgrid=False),
+                    margin=dict(t=40, b=20, l=20, r=20)
+                )
+
+                st.plotly_chart(fig, use_container_width=True)
+
+            st.markdown('</div>', unsafe_allow_html=True)
+
+        with col4:
+            st.markdown('<div class="chart-container">', unsafe_allow_html=True)
+
+            if 'Registration_Date' in df_filtered.columns:
+                monthly_data = aggregates['registration_trend']
+
+                fig = px.line(
+                    monthly_data,
+                    x='Month',
+                    y='Patients',
+                    title="Registration Trend",
+                    markers=True
+                )
+
+                fig.update_traces(
+                    line_color='#3b82f6',
+                    line_width=3,
+                    marker=dict(size=8)
+                )
+
+                fig.update_layout(
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    font=dict(family="Inter", size=12),
+                    title_font_size=16,
+                    title_font_color='#1e293b',
+                    xaxis=dict(showgrid=False),
+                    yaxis=dict(showgrid=True, gridcolor='#e2e8f0'),
+                    margin=dict(t=40, b=20, l=20, r=20)
+                )
+
+                st.plotly_chart(fig, use_container_width=True)
+
+            st.markdown('</div>', unsafe_allow_html=True)
     
-    with tab2:
+    if active_view == views[1]:
         st.markdown('<div class="section-card">', unsafe_allow_html=True)
         st.markdown('<div class="section-header"><h2 style="margin:0;">🩺 Therapy Counseling Analytics</h2></div>', unsafe_allow_html=True)
         
         col1, col2 = st.columns(2)
         with col1:
             if 'Therapy_Type' in df_filtered.columns and 'Case_Status' in df_filtered.columns:
-                therapy_sessions = df_filtered.groupby(['Therapy_Type', 'Case_Status']).size().reset_index(name='Count')
+                therapy_sessions = aggregates['therapy_status_counts']
                 fig = px.bar(therapy_sessions, x='Therapy_Type', y='Count', color='Case_Status', title="Therapy Type Performance", barmode='group', color_discrete_sequence=['#3b82f6', '#10b981', '#f59e0b'])
                 fig.update_layout(
                     paper_bgcolor='rgba(0,0,0,0)',
@@ -741,7 +1068,7 @@ if is_mental_health and all(col in df_filtered.columns for col in ['Gender', 'Pr
         
         with col2:
             if 'Therapy_Type' in df_filtered.columns and 'Sessions_Attended' in df_filtered.columns:
-                avg_sessions = df_filtered.groupby('Therapy_Type')['Sessions_Attended'].mean().sort_values(ascending=False).head(8).reset_index()
+                avg_sessions = aggregates['avg_sessions_by_therapy']
                 fig = px.bar(avg_sessions, x='Sessions_Attended', y='Therapy_Type', orientation='h', title="Avg Sessions by Therapy Type", color='Sessions_Attended', color_continuous_scale='Blues')
                 fig.update_layout(
                     paper_bgcolor='rgba(0,0,0,0)',
@@ -756,68 +1083,64 @@ if is_mental_health and all(col in df_filtered.columns for col in ['Gender', 'Pr
                 st.plotly_chart(fig, use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
     
-    with tab3:
+    if active_view == views[2]:
         st.markdown('<div class="section-card">', unsafe_allow_html=True)
         st.markdown('<div class="section-header"><h2 style="margin:0;">🏥 Psychiatric Care Analytics</h2></div>', unsafe_allow_html=True)
         
         if 'Program_Type' in df_filtered.columns:
-            psych_data = df_filtered[df_filtered['Program_Type'] == 'Psychiatric Care']
-            if len(psych_data) > 0:
+            psych = aggregates['program_kpis']['Psychiatric Care']
+            if psych['patients'] > 0:
                 cols = st.columns(3)
                 with cols[0]:
                     st.markdown('<div class="kpi-container"><div class="kpi-icon icon-blue">🏥</div>', unsafe_allow_html=True)
-                    st.metric("Psychiatric Patients", f"{len(psych_data):,}")
+                    st.metric("Psychiatric Patients", f"{psych['patients']:,}")
                     st.markdown('</div>', unsafe_allow_html=True)
                 with cols[1]:
-                    if 'Risk_Level' in psych_data.columns:
-                        high_risk = len(psych_data[psych_data['Risk_Level'] == 'High'])
+                    if psych['high_risk'] is not None:
                         st.markdown('<div class="kpi-container"><div class="kpi-icon icon-orange">🚨</div>', unsafe_allow_html=True)
-                        st.metric("High Risk", f"{high_risk:,}")
+                        st.metric("High Risk", f"{psych['high_risk']:,}")
                         st.markdown('</div>', unsafe_allow_html=True)
                 with cols[2]:
-                    if 'Case_Status' in psych_data.columns:
-                        completed = len(psych_data[psych_data['Case_Status'] == 'Completed'])
+                    if psych['completed'] is not None:
                         st.markdown('<div class="kpi-container"><div class="kpi-icon icon-green">✅</div>', unsafe_allow_html=True)
-                        st.metric("Completion Rate", f"{(completed/len(psych_data)*100):.1f}%")
+                        st.metric("Completion Rate", f"{(psych['completed']/psych['patients']*100):.1f}%")
                         st.markdown('</div>', unsafe_allow_html=True)
             else:
                 st.warning("⚠️ No psychiatric care data available")
         st.markdown('</div>', unsafe_allow_html=True)
     
-    with tab4:
+    if active_view == views[3]:
         st.markdown('<div class="section-card">', unsafe_allow_html=True)
         st.markdown('<div class="section-header"><h2 style="margin:0;">💊 Substance Use Treatment</h2></div>', unsafe_allow_html=True)
         
         if 'Program_Type' in df_filtered.columns:
-            substance_data = df_filtered[df_filtered['Program_Type'] == 'Substance Use Treatment']
-            if len(substance_data) > 0:
+            substance = aggregates['program_kpis']['Substance Use Treatment']
+            if substance['patients'] > 0:
                 cols = st.columns(3)
                 with cols[0]:
                     st.markdown('<div class="kpi-container"><div class="kpi-icon icon-purple">💊</div>', unsafe_allow_html=True)
-                    st.metric("Patients", f"{len(substance_data):,}")
+                    st.metric("Patients", f"{substance['patients']:,}")
                     st.markdown('</div>', unsafe_allow_html=True)
                 with cols[1]:
-                    if 'Case_Status' in substance_data.columns:
-                        completed = len(substance_data[substance_data['Case_Status'] == 'Completed'])
+                    if substance['completed'] is not None:
                         st.markdown('<div class="kpi-container"><div class="kpi-icon icon-green">✅</div>', unsafe_allow_html=True)
-                        st.metric("Completion Rate", f"{(completed/len(substance_data)*100):.1f}%")
+                        st.metric("Completion Rate", f"{(substance['completed']/substance['patients']*100):.1f}%")
                         st.markdown('</div>', unsafe_allow_html=True)
                 with cols[2]:
-                    if 'Sessions_Attended' in substance_data.columns:
+                    if substance['avg_sessions'] is not None:
                         st.markdown('<div class="kpi-container"><div class="kpi-icon icon-blue">📊</div>', unsafe_allow_html=True)
-                        st.metric("Avg Sessions", f"{substance_data['Sessions_Attended'].mean():.1f}")
+                        st.metric("Avg Sessions", f"{substance['avg_sessions']:.1f}")
                         st.markdown('</div>', unsafe_allow_html=True)
             else:
                 st.warning("⚠️ No substance use data available")
         st.markdown('</div>', unsafe_allow_html=True)
     
-    with tab5:
+    if active_view == views[4]:
         st.markdown('<div class="section-card">', unsafe_allow_html=True)
         st.markdown('<div class="section-header"><h2 style="margin:0;">👨‍⚕️ Provider Performance</h2></div>', unsafe_allow_html=True)
         
         if 'Provider_Name' in df_filtered.columns:
-            provider_data = df_filtered['Provider_Name'].value_counts().head(15).reset_index()
-            provider_data.columns = ['Provider', 'Patient_Count']
+            provider_data = aggregates['provider_counts']
             fig = px.bar(provider_data, x='Patient_Count', y='Provider', orientation='h', title="Top 15 Providers by Patient Load", color='Patient_Count', color_continuous_scale='Blues')
             fig.update_layout(
                 paper_bgcolor='rgba(0,0,0,0)',
@@ -832,14 +1155,12 @@ if is_mental_health and all(col in df_filtered.columns for col in ['Gender', 'Pr
             st.plotly_chart(fig, use_container_width=True)
         st.markdown('</div>', unsafe_allow_html=True)
     
-    with tab6:
+    if active_view == views[5]:
         st.markdown('<div class="section-card">', unsafe_allow_html=True)
         st.markdown('<div class="section-header"><h2 style="margin:0;">📅 Appointment Scheduling</h2></div>', unsafe_allow_html=True)
         
         if 'Registration_Date' in df_filtered.columns and 'Program_Type' in df_filtered.columns:
-            df_temp = df_filtered.copy()
-            df_temp['Month'] = df_temp['Registration_Date'].dt.month
-            monthly_prog = df_temp.groupby(['Month', 'Program_Type']).size().reset_index(name='Count')
+            monthly_prog = aggregates['monthly_program_counts']
             fig = px.bar(monthly_prog, x='Month', y='Count', color='Program_Type', title="Monthly Appointments by Program", color_discrete_sequence=['#3b82f6', '#10b981', '#f59e0b', '#8b5cf6'])
             fig.update_layout(
                 paper_bgcolor='rgba(0,0,0,0)',
@@ -855,9 +1176,11 @@ if is_mental_health and all(col in df_filtered.columns for col in ['Gender', 'Pr
         st.markdown('</div>', unsafe_allow_html=True)
 
 else:
-    tab1, tab2, tab3 = st.tabs(["📊 Overview", "📈 Distributions", "🔍 Relationships"])
+    views = ["📊 Overview", "📈 Distributions", "🔍 Relationships"]
+    active_view = st.radio("View", views, horizontal=True, label_visibility="collapsed", key="generic_view")
+    profiler.start(f"view: {active_view}")
     
-    with tab1:
+    if active_view == views[0]:
         st.markdown('<div class="section-card">', unsafe_allow_html=True)
         st.markdown('<div class="section-header"><h2 style="margin:0;">📊 Data Overview</h2></div>', unsafe_allow_html=True)
         
@@ -865,8 +1188,7 @@ else:
         if len(categorical_cols) > 0:
             with col1:
                 cat_col = categorical_cols[0]
-                cat_data = df_filtered[cat_col].value_counts().head(15).reset_index()
-                cat_data.columns = [cat_col, 'Count']
+                cat_data = cached_result(f'top15:{cat_col}', lambda: df_filtered[cat_col].value_counts().head(15).reset_index().set_axis([cat_col, 'Count'], axis=1))
                 fig = px.bar(cat_data, x='Count', y=cat_col, orientation='h', title=f"Top 15 {cat_col}", color='Count', color_continuous_scale='Viridis')
                 fig.update_layout(
                     paper_bgcolor='rgba(0,0,0,0)',
@@ -883,7 +1205,8 @@ else:
         if len(numeric_cols) > 0:
             with col2:
                 num_col = numeric_cols[0]
-                fig = px.histogram(df_filtered, x=num_col, title=f"Distribution of {num_col}", nbins=30, color_discrete_sequence=['#3b82f6'])
+                bins = cached_result(f'hist:{num_col}', lambda: histogram_bins(df_filtered[num_col]))
+                fig = histogram_figure(bins, num_col, f"Distribution of {num_col}")
                 fig.update_layout(
                     paper_bgcolor='rgba(0,0,0,0)',
                     plot_bgcolor='rgba(0,0,0,0)',
@@ -903,8 +1226,7 @@ else:
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
             if len(categorical_cols) > 1:
                 cat_col2 = categorical_cols[1]
-                cat_data2 = df_filtered[cat_col2].value_counts().head(10).reset_index()
-                cat_data2.columns = [cat_col2, 'Count']
+                cat_data2 = cached_result(f'top10:{cat_col2}', lambda: df_filtered[cat_col2].value_counts().head(10).reset_index().set_axis([cat_col2, 'Count'], axis=1))
                 fig = px.pie(cat_data2, names=cat_col2, values='Count', title=f"{cat_col2} Distribution", hole=0.45, color_discrete_sequence=['#3b82f6', '#10b981', '#f59e0b', '#8b5cf6', '#ec4899'])
                 fig.update_layout(
                     paper_bgcolor='rgba(0,0,0,0)',
@@ -921,9 +1243,9 @@ else:
             st.markdown('<div class="chart-container">', unsafe_allow_html=True)
             if len(date_cols) > 0:
                 date_col = date_cols[0]
-                time_data = df_filtered.groupby(df_filtered[date_col].dt.to_period('M')).size().reset_index()
-                time_data.columns = ['Period', 'Count']
-                time_data['Period'] = time_data['Period'].astype(str)
+                time_data = cached_result(f'monthly:{date_col}', lambda: (
+                    df_filtered.groupby(df_filtered[date_col].dt.strftime('%Y-%m').rename('Period')).size().reset_index(name='Count')
+                ))
                 fig = px.line(time_data, x='Period', y='Count', title=f"Trend Over Time ({date_col})", markers=True)
                 fig.update_traces(line_color='#3b82f6', line_width=3, marker=dict(size=8))
                 fig.update_layout(
@@ -939,87 +1261,75 @@ else:
                 st.plotly_chart(fig, use_container_width=True)
             st.markdown('</div>', unsafe_allow_html=True)
     
-    with tab2:
+    if active_view == views[1]:
         st.markdown('<div class="section-card">', unsafe_allow_html=True)
         st.markdown(
-        '<div class="section-header"><h2 style="margin:0;">📈 Distributions & Statistical Analysis</h2></div>',
-        unsafe_allow_html=True
-    )
+            '<div class="section-header"><h2 style="margin:0;">📈 Distributions & Statistical Analysis</h2></div>',
+            unsafe_allow_html=True
+        )
 
-    if len(numeric_cols) > 0:
-        col1, col2 = st.columns(2)
+        if len(numeric_cols) > 0:
+            col1, col2 = st.columns(2)
 
-        with col1:
-            selected_num = st.selectbox(
-                "Select numeric column:",
-                numeric_cols,
-                key="dist_col"
-            )
+            with col1:
+                selected_num = st.selectbox(
+                    "Select numeric column:",
+                    numeric_cols,
+                    key="dist_col"
+                )
 
-        with col2:
-            chart_type = st.selectbox(
-                "Chart type:",
-                ["Histogram", "Box Plot", "Violin Plot"],
-                key="chart_type"
-            )
+            with col2:
+                chart_type = st.selectbox(
+                    "Chart type:",
+                    ["Histogram", "Box Plot", "Violin Plot"],
+                    key="chart_type"
+                )
 
-        # -------- Create Chart --------
-        if chart_type == "Histogram":
-            fig = px.histogram(
-                df_filtered,
-                x=selected_num,
-                title=f"Distribution of {selected_num}",
-                nbins=30,
-                color_discrete_sequence=['#3b82f6']
-            )
+            # -------- Create Chart --------
+            # Built from server-side summaries (bin counts, quartiles, a KDE
+            # grid), so the payload doesn't grow with the row count
+            if chart_type == "Histogram":
+                bins = cached_result(f'hist:{selected_num}', lambda: histogram_bins(df_filtered[selected_num]))
+                fig = histogram_figure(bins, selected_num, f"Distribution of {selected_num}")
 
-        elif chart_type == "Box Plot":
-            fig = px.box(
-                df_filtered,
-                y=selected_num,
-                title=f"Box Plot of {selected_num}",
-                color_discrete_sequence=['#3b82f6']
-            )
+            else:
+                stats = cached_result(f'box:{selected_num}', lambda: box_stats(df_filtered[selected_num]))
+                if chart_type == "Box Plot":
+                    fig = box_figure(stats, selected_num, f"Box Plot of {selected_num}")
+                else:
+                    kde = cached_result(f'kde:{selected_num}', lambda: kde_grid(df_filtered[selected_num]))
+                    fig = violin_figure(kde, stats, selected_num, f"Violin Plot of {selected_num}")
 
-        else:
-            fig = px.violin(
-                df_filtered,
-                y=selected_num,
-                title=f"Violin Plot of {selected_num}",
-                box=True,
-                color_discrete_sequence=['#3b82f6']
+            fig.update_layout(
+                paper_bgcolor='rgba(0,0,0,0)',
+                plot_bgcolor='rgba(0,0,0,0)',
+                font=dict(family="Inter", size=12),
+                title_font_size=16,
+                title_font_color='#1e293b',
+                xaxis=dict(showgrid=False),
+                yaxis=dict(showgrid=True, gridcolor='#e2e8f0'),
+                margin=dict(t=40, b=20, l=20, r=20)
             )
 
-        fig.update_layout(
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font=dict(family="Inter", size=12),
-            title_font_size=16,
-            title_font_color='#1e293b',
-            xaxis=dict(showgrid=False),
-            yaxis=dict(showgrid=True, gridcolor='#e2e8f0'),
-            margin=dict(t=40, b=20, l=20, r=20)
-        )
-
-        # ✅ UNIQUE KEY FIX
-        st.plotly_chart(
-            fig,
-            use_container_width=True,
-            key=f"dist_chart_{selected_num}_{chart_type}"
-        )
+            # ✅ UNIQUE KEY FIX
+            st.plotly_chart(
+                fig,
+                use_container_width=True,
+                key=f"dist_chart_{selected_num}_{chart_type}"
+            )
 
-        st.markdown("### 📊 Statistical Summary")
-        st.dataframe(
-            df_filtered[numeric_cols].describe(),
-            use_container_width=True
-        )
+            st.markdown("### 📊 Statistical Summary")
+            st.dataframe(
+                cached_result('describe', lambda: df_filtered[numeric_cols].describe()),
+                use_container_width=True
+            )
 
-    else:
-        st.warning("⚠️ No numeric columns found")
+        else:
+            st.warning("⚠️ No numeric columns found")
 
-    st.markdown('</div>', unsafe_allow_html=True)
+        st.markdown('</div>', unsafe_allow_html=True)
 
-    with tab3:
+    if active_view == views[2]:
         st.markdown('<div class="section-card">', unsafe_allow_html=True)
         st.markdown('<div class="section-header"><h2 style="margin:0;">🔍 Relationship Analysis</h2></div>', unsafe_allow_html=True)
         
@@ -1028,7 +1338,7 @@ else:
         with col1:
             x_col = st.selectbox("X-axis:", all_cols, key="x_axis")
         with col2:
-            y_col = st.selectbox("Y-axis:", all_cols, key="y_axis")
+            y_col = st.selectbox("Y-axis:", all_cols, index=1 if len(all_cols) > 1 else 0, key="y_axis")
         
         if x_col and y_col:
             x_is_numeric = x_col in numeric_cols
@@ -1036,7 +1346,38 @@ else:
             
             if x_is_numeric and y_is_numeric:
                 color_col = st.selectbox("Color by (optional):", ["None"] + categorical_cols[:5], key="color_by")
-                fig = px.scatter(df_filtered, x=x_col, y=y_col, color=None if color_col == "None" else color_col, title=f"{y_col} vs {x_col}", trendline="ols" if len(df_filtered) > 10 else None)
+                color = None if color_col == "None" else color_col
+                # Large-data mode: only a sample stratified by the color groups
+                # goes to the browser (as WebGL traces above the threshold),
+                # while the trendlines are fitted on every filtered row
+                sample_positions = cached_result(f'scatter_sample:{color}', lambda: stratified_sample(df_filtered[color] if color else None, len(df_filtered)))
+                points = df_filtered if sample_positions is None else df_filtered.take(sample_positions)
+                fig = px.scatter(
+                    x=points[x_col].to_numpy(),
+                    y=points[y_col].to_numpy(),
+                    color=points[color] if color else None,
+                    labels={'x': x_col, 'y': y_col, 'color': color_col},
+                    title=f"{y_col} vs {x_col}",
+                    render_mode='webgl' if len(points) > SCATTER_WEBGL_THRESHOLD else 'auto'
+                )
+                if len(df_filtered) > 10:
+                    fits = cached_result(f'ols:{x_col}:{y_col}:{color}', lambda: ols_by_group(df_filtered[x_col], df_filtered[y_col], df_filtered[color] if color else None))
+                    trace_colors = {trace.name: trace.marker.color for trace in fig.data}
+                    for fit in fits.itertuples():
+                        name = '' if color is None else str(fit.group)
+                        fig.add_trace(go.Scatter(
+                            x=[fit.x_min, fit.x_max],
+                            y=[fit.slope * fit.x_min + fit.intercept, fit.slope * fit.x_max + fit.intercept],
+                            mode='lines',
+                            name=name,
+                            legendgroup=name,
+                            showlegend=False,
+                            line=dict(color=trace_colors.get(name)),
+                            hovertemplate=f"<b>OLS trendline</b><br>{y_col} = {fit.slope:.4g} * {x_col} + {fit.intercept:.4g}<br>R²={fit.r2:.4f}<extra>{name}</extra>"
+                        ))
+                if sample_positions is not None:
+                    st.caption(f"⚡ Showing a {len(points):,}-point sample of {len(df_filtered):,} rows"
+                               + (f", stratified by {color_col}" if color else "") + "; trendlines use all rows")
                 fig.update_layout(
                     paper_bgcolor='rgba(0,0,0,0)',
                     plot_bgcolor='rgba(0,0,0,0)',
@@ -1049,7 +1390,7 @@ else:
                 )
                 st.plotly_chart(fig, use_container_width=True)
             elif not x_is_numeric and y_is_numeric:
-                agg_data = df_filtered.groupby(x_col)[y_col].mean().sort_values(ascending=False).head(15).reset_index()
+                agg_data = cached_result(f'mean_by:{x_col}:{y_col}', lambda: df_filtered.groupby(x_col)[y_col].mean().sort_values(ascending=False).head(15).reset_index())
                 fig = px.bar(agg_data, x=x_col, y=y_col, title=f"Average {y_col} by {x_col}", color=y_col, color_continuous_scale='Viridis')
                 fig.update_layout(
                     paper_bgcolor='rgba(0,0,0,0)',
@@ -1064,7 +1405,7 @@ else:
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 try:
-                    cross_tab = pd.crosstab(df_filtered[x_col], df_filtered[y_col])
+                    cross_tab = cached_result(f'crosstab:{x_col}:{y_col}', lambda: pd.crosstab(df_filtered[x_col], df_filtered[y_col]))
                     fig = px.imshow(cross_tab, title=f"{x_col} vs {y_col}", labels=dict(x=y_col, y=x_col, color="Count"), color_continuous_scale='Blues')
                     fig.update_layout(
                         paper_bgcolor='rgba(0,0,0,0)',
@@ -1080,7 +1421,7 @@ else:
         
         if len(numeric_cols) >= 2:
             st.markdown("### 🔗 Correlation Matrix")
-            corr_matrix = df_filtered[numeric_cols].corr()
+            corr_matrix = cached_result('corr', lambda: df_filtered[numeric_cols].corr())
             fig = px.imshow(corr_matrix, title="Correlation Matrix", color_continuous_scale='RdBu', aspect="auto", labels=dict(color="Correlation"))
             fig.update_layout(
                 paper_bgcolor='rgba(0,0,0,0)',
@@ -1098,154 +1439,34 @@ else:
 
 # ===================== FOOTER =====================
 
-# ===================== AGE DISTRIBUTION =====================
-with col2:
-    if 'Age' in df_filtered.columns:
-        age_bins = pd.cut(
-            df_filtered['Age'],
-            bins=[0, 30, 50, 70, 100],
-            labels=['18-30', '31-50', '51-70', '70+']
-        )
-
-        age_data = age_bins.value_counts().sort_index().reset_index()
-        age_data.columns = ['Age Group', 'Count']
-
-        fig = px.bar(
-            age_data,
-            x='Age Group',
-            y='Count',
-            title="Age Distribution",
-            color='Count',
-            color_continuous_scale='Blues'
-        )
-
-        fig.update_layout(
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font=dict(family="Inter", size=12),
-            title_font_size=16,
-            title_font_color='#1e293b',
-            xaxis=dict(showgrid=False),
-            yaxis=dict(showgrid=True, gridcolor='#e2e8f0'),
-            margin=dict(t=40, b=20, l=20, r=20)
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
-
-
-# ===================== CITY & TREND CHARTS =====================
-col3, col4 = st.columns(2)
-
-with col3:
-    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-
-    if 'City' in df_filtered.columns:
-        city_data = df_filtered['City'].value_counts().head(10).reset_index()
-        city_data.columns = ['City', 'Patients']
-
-        fig = px.bar(
-            city_data,
-            x='Patients',
-            y='City',
-            orientation='h',
-            title="Top 10 Cities",
-            color='Patients',
-            color_continuous_scale='Viridis'
-        )
-
-        fig.update_layout(
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font=dict(family="Inter", size=12),
-            title_font_size=16,
-            title_font_color='#1e293b',
-            xaxis=dict(showgrid=True, gridcolor='#e2e8f0'),
-            yaxis=dict(showgrid=False),
-            margin=dict(t=40, b=20, l=20, r=20)
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
-
-    st.markdown('</div>', unsafe_allow_html=True)
-
-
-with col4:
-    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-
-    if 'Registration_Date' in df_filtered.columns:
-        monthly_data = (
-            df_filtered
-            .groupby(df_filtered['Registration_Date'].dt.to_period('M'))
-            .size()
-            .reset_index()
-        )
-
-        monthly_data.columns = ['Month', 'Patients']
-        monthly_data['Month'] = monthly_data['Month'].astype(str)
-
-        fig = px.line(
-            monthly_data,
-            x='Month',
-            y='Patients',
-            title="Registration Trend",
-            markers=True
-        )
-
-        fig.update_traces(
-            line_color='#3b82f6',
-            line_width=3,
-            marker=dict(size=8)
-        )
-
-        fig.update_layout(
-            paper_bgcolor='rgba(0,0,0,0)',
-            plot_bgcolor='rgba(0,0,0,0)',
-            font=dict(family="Inter", size=12),
-            title_font_size=16,
-            title_font_color='#1e293b',
-            xaxis=dict(showgrid=False),
-            yaxis=dict(showgrid=True, gridcolor='#e2e8f0'),
-            margin=dict(t=40, b=20, l=20, r=20)
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
-
-    st.markdown('</div>', unsafe_allow_html=True)
-
 # ========== EXPORT SECTION ==========
+profiler.start("export")
 st.markdown('<div class="section-card">', unsafe_allow_html=True)
 st.markdown('<div class="section-header"><h2 style="margin:0;">💾 Export Data</h2><span class="stats-badge">{:,} records</span></div>'.format(len(df_filtered)), unsafe_allow_html=True)
 
-col1, col2 = st.columns(2)
-
-with col1:
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df_filtered.to_excel(writer, sheet_name='Data', index=False)
-        if len(numeric_cols) > 0:
-            summary = df_filtered[numeric_cols].describe()
-            summary.to_excel(writer, sheet_name='Statistics')
-    st.download_button(
-        "📥 Download Excel Report",
-        output.getvalue(),
-        f"data_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        use_container_width=True
-    )
-
-with col2:
-    csv = df_filtered.to_csv(index=False)
-    st.download_button(
-        "📊 Download CSV",
-        csv,
-        f"filtered_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-        "text/csv",
-        use_container_width=True
-    )
+# Files are generated only when a button is clicked (the callable runs on
+# Streamlit's download thread) and streamed in chunks through a temp file
+export_stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+export_labels = {'excel': "📥 Download Excel Report", 'csv': "📊 Download CSV", 'parquet': "🗄️ Download Parquet"}
+export_names = {'excel': 'data_export', 'csv': 'filtered_data', 'parquet': 'filtered_data'}
+
+formats = available_formats()
+for col, fmt in zip(st.columns(len(formats)), formats):
+    mime, extension = EXPORT_FORMATS[fmt]
+    with col:
+        st.download_button(
+            export_labels[fmt],
+            partial(export_bytes, df_filtered, fmt, list(numeric_cols)),
+            f"{export_names[fmt]}_{export_stamp}.{extension}",
+            mime,
+            on_click="ignore",
+            use_container_width=True
+        )
 
 st.markdown('</div>', unsafe_allow_html=True)
 
 
+profiler.start("footer")
 data_source_name = (
     uploaded_file.name
     if data_source == "Upload New CSV File" and 'uploaded_file' in locals() and uploaded_file
@@ -1269,3 +1490,27 @@ st.markdown(
     """,
     unsafe_allow_html=True
 )
+
+# ========== PROFILER PANEL ==========
+timings = profiler.finish(
+    script="app.py",
+    view=active_view,
+    rows=len(df_filtered),
+    total_rows=total_records,
+    filter_state=state_key,
+)
+if profiler.enabled:
+    with st.expander("⏱️ Rerun Profile", expanded=True):
+        total_ms = sum(record['ms'] for record in timings if record['parent'] is None)
+        st.caption(f"{total_ms:,.1f} ms this rerun · nested steps are included in their section's time · also logged as JSON to stderr")
+        st.dataframe(
+            pd.DataFrame(timings).sort_values('ms', ascending=False),
+            column_config={
+                'section': "Section",
+                'parent': "Within",
+                'ms': st.column_config.NumberColumn("Time (ms)", format="%.1f"),
+                'share': st.column_config.ProgressColumn("Share of rerun", format="percent", min_value=0.0, max_value=1.0),
+            },
+            hide_index=True,
+            use_container_width=True
+        )
@@ -10,7 +10,7 @@ st.set_page_config(layout="wide", page_title="Zimbabwe Mental Health Analysis")
 @st.cache_data
 def load_data():
     np.random.seed(42)
-    dates = pd.date_range('2023-01-01', periods=10, freq='M').strftime('%Y-%m')
+    dates = pd.date_range('2023-01-01', periods=10, freq='ME').strftime('%Y-%m')
     age_groups = ['18-25', '26-35', '36-45', '46+']
     genders = ['Male', 'Female']
     statuses = ['Single', 'Married', 'Divorced']
@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+
+# ----------------------------
+# SCATTER (large-data mode)
+# ----------------------------
+# Above this many points the scatter is drawn with WebGL traces
+SCATTER_WEBGL_THRESHOLD = 5_000
+
+# Points sent to the browser at most; the rest are sampled away
+SCATTER_MAX_POINTS = 20_000
+
+# Every color group keeps at least this many points (or all it has)
+SCATTER_MIN_PER_GROUP = 50
+
+
+def _group_codes(groups, n_rows):
+    """Dense group codes (missing values form their own group) and group labels"""
+    if groups is None:
+        return np.zeros(n_rows, dtype=np.int64), np.array([None], dtype=object)
+    codes, uniques = pd.factorize(groups, use_na_sentinel=False)
+    return codes, np.asarray(uniques, dtype=object)
+
+
+def stratified_sample(groups, n_rows, max_points=SCATTER_MAX_POINTS, min_per_group=SCATTER_MIN_PER_GROUP, seed=0):
+    """Sorted row positions of a sample stratified by `groups` (None: simple random sample).
+
+    Each group keeps its share of `max_points` in proportion to its size, but
+    never fewer than `min_per_group` rows, so small color groups stay visible.
+    Returns None when no sampling is needed.
+    """
+    if n_rows <= max_points:
+        return None
+    codes, _ = _group_codes(groups, n_rows)
+    sizes = np.bincount(codes)
+    quota = np.maximum(np.ceil(sizes * (max_points / n_rows)), np.minimum(sizes, min_per_group)).astype(np.int64)
+    # Random order within each group, then keep the first `quota` of each
+    order = np.lexsort((np.random.default_rng(seed).random(n_rows), codes))
+    starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+    rank = np.arange(n_rows) - starts[codes[order]]
+    return np.sort(order[rank < quota[codes[order]]])
+
+
+def ols_by_group(x, y, groups=None):
+    """Least-squares line y = slope * x + intercept per group, on all finite (x, y) pairs.
+
+    Closed form from per-group sums (one np.bincount per sum), so the fit
+    covers every row however many are plotted. Returns one row per group with
+    slope, intercept, r2, n and the x range the line spans.
+    """
+    x = pd.to_numeric(pd.Series(x), errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    y = pd.to_numeric(pd.Series(y), errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    codes, labels = _group_codes(groups, len(x))
+    valid = np.isfinite(x) & np.isfinite(y)
+    x, y, codes = x[valid], y[valid], codes[valid]
+    k = len(labels)
+
+    n = np.bincount(codes, minlength=k).astype('float64')
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = np.bincount(codes, weights=x, minlength=k) / n
+        y_mean = np.bincount(codes, weights=y, minlength=k) / n
+        # Centered sums avoid the cancellation of sum(x*x) - n*mean^2
+        dx = x - x_mean[codes]
+        dy = y - y_mean[codes]
+        sxx = np.bincount(codes, weights=dx * dx, minlength=k)
+        sxy = np.bincount(codes, weights=dx * dy, minlength=k)
+        syy = np.bincount(codes, weights=dy * dy, minlength=k)
+        slope = sxy / sxx
+        intercept = y_mean - slope * x_mean
+        r2 = sxy * sxy / (sxx * syy)
+
+    x_min = np.full(k, np.nan)
+    x_max = np.full(k, np.nan)
+    np.fmin.at(x_min, codes, x)
+    np.fmax.at(x_max, codes, x)
+    fits = pd.DataFrame({
+        'group': labels, 'slope': slope, 'intercept': intercept, 'r2': r2,
+        'n': n.astype(np.int64), 'x_min': x_min, 'x_max': x_max,
+    })
+    # A line needs at least two distinct x values
+    return fits[(fits['n'] >= 2) & (sxx > 0)].reset_index(drop=True)
+
+
+# ----------------------------
+# DISTRIBUTIONS (histogram, box, violin)
+# ----------------------------
+# Outliers drawn beyond a box plot's whiskers at most
+BOX_MAX_OUTLIERS = 1_000
+
+# Points of a violin's density curve
+KDE_GRID_POINTS = 256
+
+# Fine bins the values are counted into before smoothing; the KDE costs
+# O(rows + bins) instead of O(rows * grid points)
+KDE_BINS = 2_048
+
+
+def finite_values(values):
+    """The column's finite values as a float64 array"""
+    values = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    return values[np.isfinite(values)]
+
+
+def histogram_bins(values, nbins=30):
+    """Bin counts of a numeric column: one row per bin with start, end and count.
+
+    Integer columns spanning no more than `nbins` values get one bin per
+    integer, so small scales (scores, counts) don't show empty gaps.
+    """
+    values = finite_values(values)
+    if len(values) == 0:
+        return pd.DataFrame({'start': [], 'end': [], 'count': []})
+    low, high = values.min(), values.max()
+    if np.all(values % 1 == 0) and high - low < nbins:
+        edges = np.arange(low - 0.5, high + 1.5)
+    else:
+        edges = np.histogram_bin_edges(values, bins=nbins)
+    counts, edges = np.histogram(values, bins=edges)
+    return pd.DataFrame({'start': edges[:-1], 'end': edges[1:], 'count': counts})
+
+
+def box_stats(values, max_outliers=BOX_MAX_OUTLIERS, seed=0):
+    """Quartiles, Tukey whiskers (furthest values within 1.5 IQR), mean, sd and outliers.
+
+    At most `max_outliers` outliers are returned (a random subset), so the
+    chart's size doesn't grow with the row count.
+    """
+    values = finite_values(values)
+    if len(values) == 0:
+        return None
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    lower, upper = inside.min(), inside.max()
+    outliers = values[(values < lower) | (values > upper)]
+    n_outliers = len(outliers)
+    if n_outliers > max_outliers:
+        outliers = np.random.default_rng(seed).choice(outliers, max_outliers, replace=False)
+    return {
+        'q1': q1, 'median': median, 'q3': q3,
+        'lowerfence': lower, 'upperfence': upper,
+        'mean': values.mean(), 'sd': values.std(ddof=1) if len(values) > 1 else 0.0,
+        'n': len(values), 'outliers': np.sort(outliers), 'n_outliers': n_outliers,
+    }
+
+
+def kde_grid(values, grid_points=KDE_GRID_POINTS, bins=KDE_BINS):
+    """Gaussian kernel density of a column on an even grid: (grid, density), or None.
+
+    Values are counted into fine bins, and the counts convolved with the
+    kernel sampled at the bin spacing (binned KDE). The bandwidth follows
+    Silverman's rule of thumb, as plotly's violins do.
+    """
+    values = finite_values(values)
+    n = len(values)
+    if n < 2:
+        return None
+    q1, q3 = np.percentile(values, [25, 75])
+    spread = min(values.std(ddof=1), (q3 - q1) / 1.349) or values.std(ddof=1)
+    bandwidth = 0.9 * spread * n ** -0.2
+    if not bandwidth > 0:
+        return None
+    # The curve reaches slightly past the data, like plotly's default span
+    low, high = values.min() - 2 * bandwidth, values.max() + 2 * bandwidth
+    counts, edges = np.histogram(values, bins=bins, range=(low, high))
+    step = edges[1] - edges[0]
+    half_width = int(min(np.ceil(4 * bandwidth / step), bins))
+    offsets = np.arange(-half_width, half_width + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    density = np.convolve(counts, kernel)[half_width:half_width + bins] / n
+    centers = (edges[:-1] + edges[1:]) / 2
+    grid = np.linspace(low, high, grid_points)
+    return grid, np.interp(grid, centers, density)
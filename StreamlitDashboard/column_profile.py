@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from data_profile import HyperLogLog
+
+# Text columns with at least this many rows get an approximate distinct count
+APPROX_DISTINCT_MIN_ROWS = 100_000
+
+# Rows hashed into one HyperLogLog sketch before it's merged into the
+# column's; bounds the hash buffer however long the column is
+SKETCH_CHUNK_ROWS = 250_000
+
+
+def distinct_count(series, approx_min_rows=APPROX_DISTINCT_MIN_ROWS):
+    """(distinct non-null values, whether the count is approximate)
+
+    Categoricals count their used codes; long text columns (Patient_ID,
+    Patient_Name) are sketched with HyperLogLog, ~0.8% standard error in a
+    fixed 16 KB instead of a hash table of every value; everything else is
+    counted exactly.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        return int(np.count_nonzero(np.bincount(codes[codes >= 0], minlength=len(series.cat.categories)))), False
+    is_text = pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+    if not is_text or len(series) < approx_min_rows:
+        return int(series.nunique()), False
+    sketch = HyperLogLog()
+    for start in range(0, len(series), SKETCH_CHUNK_ROWS):
+        sketch.merge(HyperLogLog().update(series.iloc[start:start + SKETCH_CHUNK_ROWS]))
+    return sketch.count(), True
+
+
+def column_summary(df, approx_min_rows=APPROX_DISTINCT_MIN_ROWS):
+    """Column, Type, Non-Null and Unique per column, plus the columns whose Unique is approximate"""
+    distinct = {col: distinct_count(df[col], approx_min_rows) for col in df.columns}
+    summary = pd.DataFrame({
+        'Column': df.columns,
+        'Type': df.dtypes.astype(str).to_numpy(),
+        'Non-Null': df.count().to_numpy(),
+        'Unique': [distinct[col][0] for col in df.columns],
+    })
+    return summary, [col for col in df.columns if distinct[col][1]]
@@ -0,0 +1,103 @@
+import io
+import tempfile
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is hidden without pyarrow
+    pa = pq = None
+
+# Rows converted and written at a time; bounds the writer's working memory
+EXPORT_CHUNK_ROWS = 50_000
+
+# Rows per worksheet (Excel's limit is 1,048,576 including the header)
+EXCEL_MAX_ROWS = 1_048_575
+
+EXPORT_FORMATS = {
+    'excel': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsx'),
+    'csv': ('text/csv', 'csv'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+
+def iter_chunks(df, chunk_rows=EXPORT_CHUNK_ROWS):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+# ----------------------------
+# CHUNKED WRITERS
+# ----------------------------
+def write_csv(df, out, chunk_rows=EXPORT_CHUNK_ROWS):
+    """CSV of `df` into the binary file `out`, one chunk at a time"""
+    text = io.TextIOWrapper(out, encoding='utf-8', newline='', write_through=True)
+    for i, chunk in enumerate(iter_chunks(df, chunk_rows)):
+        chunk.to_csv(text, index=False, header=(i == 0))
+    if len(df) == 0:
+        df.to_csv(text, index=False)
+    text.detach()  # leave `out` open for the caller
+
+
+def _excel_rows(chunk):
+    """Chunk rows as plain Python values (None for missing) for openpyxl"""
+    values = chunk.astype(object).where(chunk.notna(), None)
+    return values.itertuples(index=False, name=None)
+
+
+def write_excel(df, out, summary=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Excel workbook of `df` (plus an optional summary sheet) into `out`.
+
+    Uses openpyxl's write-only mode, which streams rows to disk instead of
+    keeping a cell object per value. Rows past Excel's sheet limit continue
+    on Data_2, Data_3, ...
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    header = [str(col) for col in df.columns]
+    sheets = max(1, -(-len(df) // EXCEL_MAX_ROWS))
+    for sheet in range(sheets):
+        worksheet = workbook.create_sheet('Data' if sheet == 0 else f'Data_{sheet + 1}')
+        worksheet.append(header)
+        part = df.iloc[sheet * EXCEL_MAX_ROWS:(sheet + 1) * EXCEL_MAX_ROWS]
+        for chunk in iter_chunks(part, chunk_rows):
+            for row in _excel_rows(chunk):
+                worksheet.append(row)
+    if summary is not None:
+        worksheet = workbook.create_sheet('Statistics')
+        worksheet.append([''] + [str(col) for col in summary.columns])
+        for label, row in zip(summary.index, _excel_rows(summary)):
+            worksheet.append([str(label), *row])
+    workbook.save(out)
+
+
+def write_parquet(df, out, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Parquet of `df` into `out`, one row group per chunk"""
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(out, schema) as writer:
+        for chunk in iter_chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def available_formats():
+    return [fmt for fmt in EXPORT_FORMATS if fmt != 'parquet' or pq is not None]
+
+
+def export_bytes(df, fmt, summary_columns=(), chunk_rows=EXPORT_CHUNK_ROWS):
+    """Export `df` as csv, excel (with a describe() sheet of `summary_columns`) or parquet.
+
+    The writer streams chunks into a temporary file, so only the finished
+    file is ever held in memory (Streamlit serves downloads from bytes).
+    """
+    with tempfile.TemporaryFile() as out:
+        if fmt == 'csv':
+            write_csv(df, out, chunk_rows)
+        elif fmt == 'excel':
+            summary = df[list(summary_columns)].describe() if len(summary_columns) else None
+            write_excel(df, out, summary, chunk_rows)
+        elif fmt == 'parquet':
+            write_parquet(df, out, chunk_rows)
+        else:
+            raise ValueError(f"Unknown export format: {fmt}")
+        out.seek(0)
+        return out.read()
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+
+class BitmapFilterIndex:
+    """Packed bitmap per (column, value) for the sidebar filters, built once per dataset.
+
+    A filter state {column: [values]} is answered by OR-ing the bitmaps of the
+    selected values within a column, AND-ing across columns, and returning the
+    matching row positions for a single `take` (no full-frame copy or
+    per-column scans). The index is shared across sessions and is read-only
+    once built.
+    """
+
+    def __init__(self, df, columns):
+        self.n_rows = len(df)
+        self.n_bytes = (self.n_rows + 7) // 8
+        self.bitmaps = {}
+        self.has_nulls = {}
+        for col in columns:
+            self._add_column(df[col])
+
+    def _add_column(self, series):
+        codes, uniques = pd.factorize(series)  # NaN -> -1, matching no value
+        self.bitmaps[series.name] = {
+            value: np.packbits(codes == code) for code, value in enumerate(uniques)
+        }
+        self.has_nulls[series.name] = bool((codes == -1).any())
+
+    def column_bits(self, col, values):
+        """OR of the bitmaps of `values` in `col`; None if that selects every row"""
+        bitmaps = self.bitmaps[col]
+        selected = [bitmaps[value] for value in set(values) if value in bitmaps]
+        if len(selected) == len(bitmaps) and not self.has_nulls[col]:
+            return None
+        if not selected:
+            return np.zeros(self.n_bytes, dtype=np.uint8)
+        bits = selected[0].copy()
+        for other in selected[1:]:
+            np.bitwise_or(bits, other, out=bits)
+        return bits
+
+    def bits(self, filters):
+        """AND of the per-column bitmaps; None if the filters keep every row"""
+        result = None
+        for col, values in filters.items():
+            bits = self.column_bits(col, values)
+            if bits is None:
+                continue
+            result = bits if result is None else np.bitwise_and(result, bits, out=result)
+        return result
+
+    def positions(self, filters):
+        """Row positions matching the filters (None for all rows)"""
+        bits = self.bits(filters)
+        if bits is None:
+            return None
+        nonzero = np.flatnonzero(bits)
+        if len(nonzero) > self.n_bytes // 4:
+            return np.flatnonzero(np.unpackbits(bits, count=self.n_rows))
+        # Selective filters: unpack only the bytes that have a set bit
+        hits = np.unpackbits(bits[nonzero]).reshape(-1, 8).astype(bool)
+        return (nonzero[:, None] * 8 + np.arange(8))[hits]
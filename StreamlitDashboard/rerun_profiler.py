@@ -0,0 +1,89 @@
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# Profiling is on when the page is opened with ?profile=1 or the server
+# runs with DASHBOARD_PROFILE=1
+PROFILE_QUERY_PARAM = 'profile'
+PROFILE_ENV_VAR = 'DASHBOARD_PROFILE'
+
+_TRUTHY = {'1', 'true', 'yes', 'on'}
+
+logger = logging.getLogger('dashboard.profile')
+if not logger.handlers:
+    # One JSON object per line on stderr, whatever the root logging config
+    _handler = logging.StreamHandler(sys.stderr)
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def profiling_enabled(query_params):
+    """True when the env var or the page's query parameter asks for profiling"""
+    if os.environ.get(PROFILE_ENV_VAR, '').strip().lower() in _TRUTHY:
+        return True
+    return str(query_params.get(PROFILE_QUERY_PARAM, '')).strip().lower() in _TRUTHY
+
+
+class RerunProfiler:
+    """Wall-clock timings of the named sections of one script rerun.
+
+    The script is flat, so top-level sections are checkpoints: `start(name)`
+    closes the running section and opens the next. `section(name)` times a
+    nested step (a loader, a chart) inside the running one. When disabled
+    every call is a no-op.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.records = []
+        self.started = time.perf_counter()
+        self._current = None
+
+    def start(self, name):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self._close(now)
+        self._current = (name, now)
+
+    def _close(self, now):
+        if self._current is not None:
+            name, started = self._current
+            self.records.append({'section': name, 'parent': None, 'ms': (now - started) * 1000})
+            self._current = None
+
+    @contextmanager
+    def section(self, name):
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            parent = self._current[0] if self._current is not None else None
+            self.records.append({'section': name, 'parent': parent, 'ms': (time.perf_counter() - started) * 1000})
+
+    def finish(self, **context):
+        """Close the running section, log the rerun as one JSON line and return the records"""
+        if not self.enabled:
+            return []
+        now = time.perf_counter()
+        self._close(now)
+        total_ms = (now - self.started) * 1000
+        for record in self.records:
+            record['share'] = record['ms'] / total_ms if total_ms else 0.0
+        logger.info(json.dumps({
+            'event': 'dashboard_rerun',
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'total_ms': round(total_ms, 3),
+            'sections': [{**record, 'ms': round(record['ms'], 3), 'share': round(record['share'], 4)} for record in self.records],
+            **context,
+        }, default=str))
+        return self.records
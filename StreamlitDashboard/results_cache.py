@@ -0,0 +1,106 @@
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_ENTRIES = 32
+DEFAULT_MAX_BYTES = 256 * 2**20
+
+_MISSING = object()
+
+
+def filter_state_key(dataset_key, filters):
+    """Canonical hash of a dataset plus a {column: [values]} filter state.
+
+    Column order and value order don't matter, so the same view always maps
+    to the same entry however the analyst got there.
+    """
+    state = {
+        'dataset': [str(part) for part in dataset_key],
+        'filters': {str(col): sorted(str(v) for v in values) for col, values in filters.items()},
+    }
+    return hashlib.sha256(json.dumps(state, sort_keys=True).encode()).hexdigest()
+
+
+def estimate_bytes(value):
+    """Approximate in-memory size of a cached result"""
+    if value is None:
+        return 0
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class ResultsCache:
+    """Process-wide LRU of per-filter-state results with entry-count and byte limits.
+
+    Each entry (one filter state) holds named results: the filtered row
+    positions and the aggregates derived from them. Touching any result of
+    an entry makes it most recently used; the least recently used entries are
+    evicted once either limit is exceeded. Cached values are shared between
+    sessions and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()  # key -> {name: (value, nbytes)}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, name, compute):
+        """Return the cached `name` result for `key`, computing and storing it on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                cached = entry.get(name, (_MISSING, 0))[0]
+                if cached is not _MISSING:
+                    self.hits += 1
+                    return cached
+            self.misses += 1
+
+        value = compute()
+        nbytes = estimate_bytes(value)
+        if nbytes > self.max_bytes:
+            return value  # would evict everything else; not worth holding
+
+        with self._lock:
+            entry = self._entries.setdefault(key, {})
+            self._entries.move_to_end(key)
+            if name not in entry:
+                entry[name] = (value, nbytes)
+                self.total_bytes += nbytes
+            self._evict()
+            return entry[name][0] if key in self._entries else value
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self.total_bytes -= sum(nbytes for _, nbytes in entry.values())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'bytes': self.total_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -0,0 +1,126 @@
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:  # fall back to pandas' C parser
+    pa = pacsv = None
+
+# Rows used to infer the dtype plan
+SAMPLE_ROWS = 10_000
+
+# Tried in order; the first format that parses every sampled value wins.
+# A single day above 12 in the sample rules out the wrong one of
+# day-first/month-first; only when every sampled day is 12 or less do both
+# fit, and then day-first is an arbitrary tie-break
+DATE_FORMATS = [
+    '%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y/%m/%d',
+    '%d/%m/%Y', '%m/%d/%Y', '%d-%m-%Y', '%m-%d-%Y', '%d.%m.%Y',
+    '%d/%m/%Y %H:%M', '%m/%d/%Y %H:%M', '%d %b %Y', '%b %d, %Y',
+    'ISO8601',
+]
+
+# Values checked against a date format before the whole sample is
+DATE_PROBE_ROWS = 20
+
+# Text columns become categoricals when few distinct values repeat a lot
+CATEGORICAL_MAX_UNIQUE = 1_000
+CATEGORICAL_MAX_RATIO = 0.5
+
+
+# ----------------------------
+# INFERENCE (on a sample)
+# ----------------------------
+def _parses_as_date(values, fmt):
+    probe = values.iloc[:DATE_PROBE_ROWS]
+    if pd.to_datetime(probe, format=fmt, errors='coerce').isna().any():
+        return False
+    return pd.to_datetime(values, format=fmt, errors='coerce').notna().all()
+
+
+def infer_column(values):
+    """Infer {'kind': numeric|date|categorical|text[, 'format']} from sampled text values"""
+    values = values.dropna()
+    if values.empty:
+        return {'kind': 'text'}
+    if pd.to_numeric(values, errors='coerce').notna().all():
+        return {'kind': 'numeric'}
+    for fmt in DATE_FORMATS:
+        if _parses_as_date(values, fmt):
+            return {'kind': 'date', 'format': fmt}
+    n_unique = values.nunique()
+    if n_unique <= CATEGORICAL_MAX_UNIQUE and n_unique <= CATEGORICAL_MAX_RATIO * len(values):
+        return {'kind': 'categorical'}
+    return {'kind': 'text'}
+
+
+def infer_plan(sample):
+    """Dtype plan for every column of a sample read as text"""
+    return {col: infer_column(sample[col]) for col in sample.columns}
+
+
+# ----------------------------
+# SINGLE-PASS PARSE
+# ----------------------------
+def read_csv_with_plan(source, plan):
+    """Parse the whole file once with the plan's explicit dtypes and date formats.
+
+    Numeric and free-text columns are left to the CSV engine's own typed
+    parsing. With pyarrow, categoricals are dictionary-encoded and dates
+    parsed by the multithreaded Arrow reader itself.
+    """
+    categorical = [col for col, spec in plan.items() if spec['kind'] == 'categorical']
+    date_format = {col: spec['format'] for col, spec in plan.items() if spec['kind'] == 'date'}
+
+    if pacsv is None:
+        return pd.read_csv(
+            source,
+            dtype={col: 'category' for col in categorical} or None,
+            parse_dates=list(date_format) or None,
+            date_format=date_format or None,
+        )
+
+    column_types = {col: pa.dictionary(pa.int32(), pa.string()) for col in categorical}
+    formats = set(date_format.values())
+    # Arrow applies its timestamp parsers to every timestamp column, so it
+    # only parses dates itself when all date columns share one format
+    arrow_dates = len(formats) == 1
+    if arrow_dates:
+        column_types.update({col: pa.timestamp('ns') for col in date_format})
+    else:
+        column_types.update({col: pa.string() for col in date_format})
+    convert_options = pacsv.ConvertOptions(
+        column_types=column_types,
+        timestamp_parsers=[pacsv.ISO8601 if fmt == 'ISO8601' else fmt for fmt in formats] if arrow_dates else None,
+        strings_can_be_null=True,  # empty text fields are missing values, as in pandas
+    )
+    df = pacsv.read_csv(source, convert_options=convert_options).to_pandas()
+    if not arrow_dates:
+        for col, fmt in date_format.items():
+            try:
+                df[col] = pd.to_datetime(df[col], format=fmt)
+            except ValueError:
+                pass  # the rest of the file doesn't match the sampled format; keep text
+    return df
+
+
+def read_csv_inferred(source, sample_rows=SAMPLE_ROWS):
+    """Read a CSV (path or file-like) with a dtype plan inferred from its first rows.
+
+    Returns (df, plan). If the rest of the file contradicts the sampled plan
+    (e.g. a date column with a value in another format), the plan is
+    re-inferred from the whole file and the file parsed again.
+    """
+    sample = pd.read_csv(source, nrows=sample_rows, dtype=str)
+    plan = infer_plan(sample)
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    try:
+        return read_csv_with_plan(source, plan), plan
+    except (ValueError, TypeError):  # pyarrow.ArrowInvalid is a ValueError
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        plan = infer_plan(pd.read_csv(source, dtype=str))
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return read_csv_with_plan(source, plan), plan
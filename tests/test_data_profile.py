@@ -0,0 +1,26 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'Dataset'))
+from data_profile import MAX_EXACT_DISTINCT, DatasetProfile  # noqa: E402
+
+
+def test_distinct_count_stays_accurate_after_switching_to_sketch():
+    values = np.arange(int(MAX_EXACT_DISTINCT * 1.5))
+    profile = DatasetProfile()
+    # The exact counts overflow into the sketch part-way through, then every
+    # value is seen again in float chunks (a missing value makes them float)
+    for part in np.array_split(values, 6):
+        profile.update(pd.DataFrame({'n': part, 's': part.astype(str)}))
+    for part in np.array_split(values, 6):
+        floats = part.astype('float64')
+        floats[0] = np.nan
+        profile.update(pd.DataFrame({'n': floats, 's': pd.Categorical(part.astype(str))}))
+
+    for column in ('n', 's'):
+        result = profile.columns[column].to_dict()
+        assert result['distinct_approx']
+        assert abs(result['distinct'] - len(values)) < 0.03 * len(values)
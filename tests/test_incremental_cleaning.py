@@ -0,0 +1,59 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'Dataset'))
+import data_cleaning  # noqa: E402
+from kpi_cube import load_cube  # noqa: E402
+from schema import read_clean_arrow  # noqa: E402
+
+RAW_PATH = Path(__file__).resolve().parent.parent / 'Dataset' / 'RawData' / 'Mental_Health_Patients_Dataset_3000.xlsx'
+
+
+def test_row_hashes_ignore_chunk_dtypes():
+    ints = pd.DataFrame({'Patient_ID': ['P-1', 'P-2'], 'Age': [30, 41]})
+    floats = pd.DataFrame({'Patient_ID': ['P-1', 'P-2', 'P-3'], 'Age': [30.0, 41.0, np.nan]})
+    assert list(data_cleaning.row_hashes(ints)) == list(data_cleaning.row_hashes(floats)[:2])
+
+
+def test_new_row_with_missing_age_leaves_existing_patients_unchanged(tmp_path, capsys):
+    raw = pd.read_excel(RAW_PATH).head(2500)
+    raw_path, output_path = tmp_path / 'raw.csv', tmp_path / 'clean.csv'
+    raw.to_csv(raw_path, index=False)
+    data_cleaning.run_incremental(raw_path, output_path)
+
+    # The new patient's missing Age makes Age a float column on the next read
+    new_row = raw.tail(1).assign(Patient_ID='P-9999', Age=np.nan)
+    pd.concat([raw, new_row]).to_csv(raw_path, index=False)
+    capsys.readouterr()
+    data_cleaning.run_incremental(raw_path, output_path)
+
+    assert 'new patients: 1, changed patients: 0' in capsys.readouterr().out
+    assert pd.read_csv(output_path)['Patient_ID'].nunique() == 2500
+
+
+def test_append_only_delta_extends_outputs_instead_of_rescanning(tmp_path):
+    raw = pd.read_excel(RAW_PATH)
+    raw_path, appended_path, fresh_path = tmp_path / 'raw.csv', tmp_path / 'a' / 'clean.csv', tmp_path / 'b' / 'clean.csv'
+    raw.head(2000).to_csv(raw_path, index=False)
+    data_cleaning.run_incremental(raw_path, appended_path)
+    raw.head(2500).to_csv(raw_path, index=False)
+    data_cleaning.run_incremental(raw_path, appended_path)
+    data_cleaning.run_incremental(raw_path, fresh_path)
+
+    # The first run's batch is kept as is and the delta becomes a second one
+    with pa.memory_map(str(data_cleaning.arrow_path_for(appended_path))) as source:
+        assert pa.ipc.open_file(source).num_record_batches == 2
+    appended, fresh = (read_clean_arrow(data_cleaning.arrow_path_for(p)) for p in (appended_path, fresh_path))
+    assert appended.astype(object).equals(fresh.astype(object))
+
+    appended_cube, fresh_cube = (load_cube(p) for p in (appended_path, fresh_path))
+    assert appended_cube['Patients'].sum() == fresh_cube['Patients'].sum() == 2500
+    appended_profile, fresh_profile = (json.loads(p.with_name('clean_profile.json').read_text()) for p in (appended_path, fresh_path))
+    assert appended_profile['rows_clean'] == fresh_profile['rows_clean'] == 2500
+    for column in ('Patient_ID', 'Age', 'Case_Status'):
+        assert appended_profile['columns'][column]['distinct'] == fresh_profile['columns'][column]['distinct']
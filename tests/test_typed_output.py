@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'Dataset'))
+import data_cleaning  # noqa: E402
+
+RAW_PATH = Path(__file__).resolve().parent.parent / 'Dataset' / 'RawData' / 'Mental_Health_Patients_Dataset_3000.xlsx'
+
+
+@pytest.mark.parametrize('run', [
+    data_cleaning.run_full,
+    lambda raw_path, output_path: data_cleaning.run_streaming(raw_path, output_path, chunksize=100),
+    data_cleaning.run_incremental,
+])
+def test_out_of_range_age_is_dropped_before_the_typed_write(tmp_path, run):
+    raw = pd.read_excel(RAW_PATH).head(300)
+    raw.loc[150, 'Age'] = -1
+    raw.loc[250, 'Age'] = 300
+    raw_path, output_path = tmp_path / 'raw.csv', tmp_path / 'clean.csv'
+    raw.to_csv(raw_path, index=False)
+
+    run(raw_path, output_path)
+
+    typed = pd.read_parquet(data_cleaning.parquet_path_for(output_path))
+    assert len(typed) == 298
+    assert typed['Age'].between(0, 100).all()
+    assert not typed['Patient_ID'].isin(raw.loc[[150, 250], 'Patient_ID']).any()